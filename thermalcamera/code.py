@@ -10,152 +10,291 @@ Rename thermalcamera.py to code.py and store in the device's root directory.
 """
 
 import time
+
+boot_t0 = time.monotonic()  # Time marker: Boot Sequence Start
+
+# pylint: disable=wrong-import-position
 import gc
 import board
-import keypad
-import busio
-from ulab import numpy as np
 import displayio
-import neopixel
-from analogio import AnalogIn
-from digitalio import DigitalInOut
-from simpleio import map_range, tone
-from adafruit_display_text.label import Label
-from adafruit_bitmap_font import bitmap_font
-from adafruit_display_shapes.rect import Rect
-import adafruit_amg88xx
-from index_to_rgb.iron import index_to_rgb
-from thermalcamera_converters import celsius_to_fahrenheit, fahrenheit_to_celsius
-from thermalcamera_config import ALARM_F, MIN_RANGE_F, MAX_RANGE_F, SELFIE
+from thermalcamera_config import (
+    BOARD,
+    ALARM_F,
+    MIN_RANGE_F,
+    MAX_RANGE_F,
+    SELFIE,
+    TARGET_FRAME_TIME,
+    QUALITY_GOVERNOR,
+    QUALITY_INTERVAL,
+    SMOOTH_RENDER,
+    SMOOTH_BAND,
+    FONT_FILE,
+    BOOT_TIME_LIMIT,
+    SETTINGS_RESET,
+    SETTINGS_NVM_START,
+    SETTINGS_WRITE_DELAY,
+    ZONES,
+    RISE_ALARM_F_PER_MIN,
+    RISE_WINDOW,
+    RISE_INTERVAL,
+    BLOB_DETECT,
+    BLOB_THRESHOLD_F,
+    BLOB_MAX,
+    BLOB_MIN_AREA,
+    AUTO_RANGE_ALPHA,
+    AUTO_RANGE_RATE_F,
+    AUTO_RANGE_MIN_SPAN_F,
+    EQUALIZE,
+    EQUALIZE_ALPHA,
+    CALIBRATION_FRAMES,
+    BAD_PIXEL_F,
+    EMISSIVITY,
+    AMBIENT_INTERVAL,
+    DISPLAY_UNITS,
+    CHANGE_DETECT,
+    CHANGE_THRESHOLD_F,
+    CHANGE_HEARTBEAT,
+    POWER_SAVE,
+    IDLE_TIME,
+    SLEEP_TIME,
+    DIM_BRIGHTNESS,
+    SENSOR_INT_PIN,
+)
+from thermalcamera_display import FrameScheduler
+from thermalcamera_boards import (
+    detect_board,
+    KEY_LEFT,
+    KEY_UP,
+    KEY_DOWN,
+    KEY_RIGHT,
+    KEY_FOCUS,
+    KEY_SET,
+    KEY_HOLD,
+    KEY_IMAGE,
+)
 
 __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/CedarGroveStudios/ThermalCamera.git"
 
-# Instantiate the integral display and define its size
-display = board.DISPLAY
-display.brightness = 1.0
-WIDTH = display.width
-HEIGHT = display.height
-
-# Load the text font from the fonts folder
-font_0 = bitmap_font.load_font("/fonts/OpenSans-9.bdf")
-
-# Instantiate the joystick if available
-if hasattr(board, "JOYSTICK_X"):
-    # PyGamer with joystick
-    HAS_JOYSTICK = True
-    joystick_x = AnalogIn(board.JOYSTICK_X)
-    joystick_y = AnalogIn(board.JOYSTICK_Y)
-else:
-    # PyBadge with buttons
-    HAS_JOYSTICK = False  # PyBadge with buttons
-
-# Enable the speaker
-DigitalInOut(board.SPEAKER_ENABLE).switch_to_output(value=True)
-
-# Instantiate and clear the NeoPixels
-pixels = neopixel.NeoPixel(board.NEOPIXEL, 5, pixel_order=neopixel.GRB)
-pixels.brightness = 0.25
-pixels.fill(0x000000)
-
-# Initialize ShiftRegisterKeys to read PyGamer/PyBadge buttons
-panel = keypad.ShiftRegisterKeys(
-    clock=board.BUTTON_CLOCK,
-    data=board.BUTTON_OUT,
-    latch=board.BUTTON_LATCH,
-    key_count=8,
-    value_when_pressed=True,
+# Boot phase durations in seconds; [(phase name, duration), ...]
+BOOT_PHASES = []
+
+
+def boot_phase(name, start):
+    """Record the duration of a boot phase; returns the time marker for the
+    start of the next phase"""
+    now = time.monotonic()
+    BOOT_PHASES.append((name, now - start))
+    return now
+
+
+# ### Boot stage 1: show the splash graphics as soon as possible ###
+# Instantiate the board's display, controls, speaker, and NeoPixels
+hw = detect_board(BOARD)
+display = hw.display
+if hasattr(display, "brightness"):
+    display.brightness = 1.0
+WIDTH = hw.width
+HEIGHT = hw.height
+
+# Refresh the display once per frame rather than automatically; the EVE
+#   coprocessor swaps its own frames and is only paced
+scheduler = FrameScheduler(
+    None if hw.renderer == "eve" else display, frame_time=TARGET_FRAME_TIME
 )
 
-# Define front panel button event values
-BUTTON_LEFT = 7  # LEFT button
-BUTTON_UP = 6  # UP button
-BUTTON_DOWN = 5  # DOWN button
-BUTTON_RIGHT = 4  # RIGHT button
-BUTTON_FOCUS = 3  # SELECT button
-BUTTON_SET = 2  # START button
-BUTTON_HOLD = 1  # button A
-BUTTON_IMAGE = 0  # button B
+# Display splash graphics
+if hw.renderer == "displayio":
+    splash = displayio.Group(scale=max(1, WIDTH // 160))
+    bitmap = displayio.OnDiskBitmap("/thermalcamera_splash.bmp")
+    splash.append(displayio.TileGrid(bitmap, pixel_shader=bitmap.pixel_shader))
+    display.root_group = splash
+    scheduler.refresh()
+boot_t1 = boot_phase("splash", boot_t0)
+
+# ### Boot stage 2: import and start the sensor; it settles while the rest boots ###
+import busio
+import adafruit_amg88xx
 
 # Initiate the AMG8833 Thermal Camera
 i2c = busio.I2C(board.SCL, board.SDA, frequency=400000)
 amg8833 = adafruit_amg88xx.AMG88XX(i2c)
+boot_t1 = boot_phase("sensor", boot_t1)
 
-# Display splash graphics
-splash = displayio.Group(scale=display.width // 160)
-bitmap = displayio.OnDiskBitmap("/thermalcamera_splash.bmp")
-splash.append(displayio.TileGrid(bitmap, pixel_shader=bitmap.pixel_shader))
-display.root_group = splash
+# ### Boot stage 3: import the remaining modules ###
+import microcontroller
+from ulab import numpy as np
+from adafruit_display_text.label import Label
+from adafruit_display_shapes.rect import Rect
+from index_to_rgb.iron import index_to_rgb
+from thermalcamera_converters import (
+    c_to_f,
+    f_to_c,
+    delta_f_to_c,
+    DisplayUnits,
+)
+from thermalcamera_status import (
+    StatusOverlay,
+    PRIORITY_INFO,
+    PRIORITY_HOLD,
+    PRIORITY_SETUP,
+    PRIORITY_ALARM,
+)
+from thermalcamera_fonts import load_font, preload_glyphs
+from thermalcamera_digits import DigitSheet, DigitLabel
+from thermalcamera_zones import ZoneMonitor
+from thermalcamera_trend import RateOfRise
+from thermalcamera_blobs import find_blobs, BlobTracker
+from thermalcamera_core import ThermalCore
+from thermalcamera_agc import AutoRange
+from thermalcamera_hold import HoldAccumulator, PEAK, MIN
+from thermalcamera_calibrate import Calibration, FlatFieldCapture
+from thermalcamera_ambient import AmbientCompensation
+from thermalcamera_settings import SettingsStore
+
+boot_t1 = boot_phase("imports", boot_t1)
+
+# ### Boot stage 4: load the font and preload its glyphs ###
+# A full-frame renderer draws its text without a displayio font
+font_file = "(renderer font)"
+font_load_time = font_preload_time = 0
+if hw.renderer == "displayio":
+    # Load the text font from the fonts folder; fall back to the BDF font
+    font_0, font_file, font_load_time = load_font(
+        [FONT_FILE, "/fonts/OpenSans-9.bdf"]
+    )
+
+    # Preload every glyph the display uses so that none are loaded mid-frame
+    UI_TEXT = (
+        "0123456789-",  # Temperature values
+        "alm max min ave -RANGE-",  # Sidebar and histogram labels
+        "IRON -HOLD- FOCUS ORIG AUTO ALARM RISE -SET- RANGE RESUME CAL SAVED",  # Status messages
+        "PEAK MIN RESET",  # Accumulation mode messages
+    ) + tuple(zone["name"] for zone in ZONES)  # Zone alarm messages
+    font_preload_time = preload_glyphs(font_0, UI_TEXT)
+    digits = DigitSheet(font_0)  # Digit sprites for the numeric readouts
+
+boot_t1 = boot_phase("font", boot_t1)
+
+# ### Boot stage 5: define the controls ###
+# Define front panel button event values; the same on every board
+BUTTON_LEFT = KEY_LEFT  # LEFT button
+BUTTON_UP = KEY_UP  # UP button
+BUTTON_DOWN = KEY_DOWN  # DOWN button
+BUTTON_RIGHT = KEY_RIGHT  # RIGHT button
+BUTTON_FOCUS = KEY_FOCUS  # SELECT button
+BUTTON_SET = KEY_SET  # START button
+BUTTON_HOLD = KEY_HOLD  # button A
+BUTTON_IMAGE = KEY_IMAGE  # button B
+
+boot_t1 = boot_phase("controls", boot_t1)
 
 # Thermal sensor grid axis size; AMG8833 sensor is 8x8
 SENSOR_AXIS = 8
 
 # Display grid parameters
 GRID_AXIS = (2 * SENSOR_AXIS) - 1  # Number of cells per axis
-GRID_SIZE = HEIGHT  # Axis size (pixels) for a square grid
+GRID_SIZE = min(HEIGHT, WIDTH - 32)  # Square grid; leaves a sidebar of 32 or more
 GRID_X_OFFSET = WIDTH - GRID_SIZE  # Right-align grid with display boundary
 CELL_SIZE = GRID_SIZE // GRID_AXIS  # Size of a grid cell in pixels
-PALETTE_SIZE = 100  # Number of display colors in spectral palette (must be > 0)
+# Sidebar layout: four values, each with its caption below it or, when the
+#   display is too short, beside it
+SIDEBAR_PITCH = (HEIGHT - 8) // 4  # Value spacing in pixels; 30 on the PyGamer
+SIDEBAR_STACKED = SIDEBAR_PITCH >= 22  # Room for a caption below its value
+LEGEND_Y = HEIGHT - 7  # Histogram legend vertical center
+
+PALETTE_SIZE = 100  # Number of display colors in spectral palette (must be > 1)
+
+# Precompute the spectral palette color lookup table
+PALETTE_LUT = [index_to_rgb(i / (PALETTE_SIZE - 1)) for i in range(PALETTE_SIZE)]
 
-# Set up the 2-D sensor data narray
+# Set up the 2-D sensor data narray with a sample spectrum
 SENSOR_DATA = np.array(range(SENSOR_AXIS**2)).reshape((SENSOR_AXIS, SENSOR_AXIS))
-# Set up and load the 2-D display color index narray with a spectrum
-GRID_DATA = np.array(range(GRID_AXIS**2)).reshape((GRID_AXIS, GRID_AXIS)) / (
-    GRID_AXIS**2
-)
-# Set up the histogram accumulation narray
-# HISTOGRAM = np.zeros(GRID_AXIS)
 
-# Convert default alarm and min/max range values from config file
-ALARM_C = fahrenheit_to_celsius(ALARM_F)
-MIN_RANGE_C = fahrenheit_to_celsius(MIN_RANGE_F)
-MAX_RANGE_C = fahrenheit_to_celsius(MAX_RANGE_F)
+# Load the stored alarm, range, and calibration settings; the config file values
+#   are their factory defaults
+calibration = Calibration(axis=SENSOR_AXIS)
+settings = SettingsStore(
+    microcontroller.nvm,
+    {
+        "alarm_f": ALARM_F,
+        "min_range_f": MIN_RANGE_F,
+        "max_range_f": MAX_RANGE_F,
+        "calibration": calibration.pack(),  # Uncorrected
+    },
+    start=SETTINGS_NVM_START,
+    delay=SETTINGS_WRITE_DELAY,
+)
+if SETTINGS_RESET:
+    settings.flush()  # Replace the stored settings with the factory defaults
+else:
+    settings.load()
+ALARM_F = settings.values["alarm_f"]
+MIN_RANGE_F = settings.values["min_range_f"]
+MAX_RANGE_F = settings.values["max_range_f"]
+units = DisplayUnits(DISPLAY_UNITS)
+calibration.unpack(settings.values["calibration"])
+
+# Convert alarm and min/max range values
+ALARM_C = f_to_c(ALARM_F)
+MIN_RANGE_C = f_to_c(MIN_RANGE_F)
+MAX_RANGE_C = f_to_c(MAX_RANGE_F)
+ALARM_TEXT = str(units.from_fahrenheit(ALARM_F))  # Alarm value display string
 
 # Default colors for temperature value sidebar
 BLACK = 0x000000
 RED = 0xFF0000
 YELLOW = 0xFFFF00
+ORANGE = 0xFF8000
 CYAN = 0x00FFFF
 BLUE = 0x0000FF
 WHITE = 0xFFFFFF
 
-# Text colors for setup helper's on-screen parameters
-SETUP_COLORS = [("ALARM", WHITE), ("RANGE", RED), ("RANGE", CYAN)]
-
 
 # ### Helpers ###
 def play_tone(freq=440, duration=0.01):
     """Play a tone over the speaker"""
-    tone(board.A0, freq, duration)
+    hw.tone(freq, duration)
 
 
-def flash_status(text="", duration=0.05):
-    """Flash status message once"""
-    status_label.color = WHITE
-    status_label.text = text
-    time.sleep(duration)
-    status_label.color = BLACK
-    time.sleep(duration)
-    status_label.text = ""
+def rate(duration):
+    """The rate per second of a duration; ``time.monotonic()`` has millisecond
+    resolution, so a short duration may be zero"""
+    return 1 / max(duration, 0.001)
 
 
-def update_image_frame(selfie=False):
-    """Get camera data and update display"""
+def sidebar_position(row, caption=False):
+    """The anchored position of a sidebar value or of its caption; row 0 is
+    the top row"""
+    value_y = 5 + (row * SIDEBAR_PITCH)
+    if not caption:
+        return (1, value_y)
+    if SIDEBAR_STACKED:
+        return (1, value_y + 11)
+    return (3 + (4 * digits.tile_width), value_y)
+
+
+def update_image_frame(grid, selfie=False):
+    """Update the image cells from normalized grid data"""
+    indices = core.color_indices(grid)  # Palette indices for the whole grid
+    if frame:
+        frame.render(indices)  # The renderer applies the view orientation
+        return
     for _row in range(GRID_AXIS):
         for _col in range(GRID_AXIS):
-            if selfie:
-                color_index = GRID_DATA[GRID_AXIS - 1 - _row][_col]
-            else:
-                color_index = GRID_DATA[GRID_AXIS - 1 - _row][GRID_AXIS - 1 - _col]
-            color = index_to_rgb(round(color_index * PALETTE_SIZE, 0) / PALETTE_SIZE)
+            _grid_col = _col if selfie else GRID_AXIS - 1 - _col
+            color = PALETTE_LUT[indices[GRID_AXIS - 1 - _row][_grid_col]]
             if color != image_group[((_row * GRID_AXIS) + _col)].fill:
                 image_group[((_row * GRID_AXIS) + _col)].fill = color
 
 
-def update_histo_frame():
-    """Calculate and display histogram"""
-    min_histo.text = str(MIN_RANGE_F)  # Display the legend
-    max_histo.text = str(MAX_RANGE_F)
+def update_histo_frame(dirty_only=False):
+    """Calculate and display histogram; ``dirty_only`` writes only the cells
+    that changed"""
+    from simpleio import map_range  # pylint: disable=import-outside-toplevel
+
+    min_histo.text = units.text(MIN_RANGE_C)  # Display the legend
+    max_histo.text = units.text(MAX_RANGE_C)
 
     histogram = np.zeros(GRID_AXIS)  # Clear histogram accumulation array
     # Collect camera data and calculate the histogram
@@ -168,281 +307,581 @@ def update_histo_frame():
     if histo_scale <= 0:
         histo_scale = 1
 
+    if frame:
+        # Bars of palette indices on black in the sensor's orientation; the
+        #   renderer flips the rows and, for the rear view, the columns
+        bars = np.full((GRID_AXIS, GRID_AXIS), PALETTE_SIZE, dtype=np.uint8)
+        for _col in range(GRID_AXIS):
+            height = min(GRID_AXIS, -int(-histogram[_col] // histo_scale))
+            bars[:height, _col if SELFIE else GRID_AXIS - 1 - _col] = round(
+                _col * (PALETTE_SIZE - 1) / GRID_AXIS
+            )
+        frame.render(bars)
+        return
+
     # Display the histogram
     for _col in range(GRID_AXIS):
         for _row in range(GRID_AXIS):
             if histogram[_col] / histo_scale > GRID_AXIS - 1 - _row:
-                image_group[((_row * GRID_AXIS) + _col)].fill = index_to_rgb(
-                    round((_col / GRID_AXIS), 3)
-                )
+                color = index_to_rgb(round((_col / GRID_AXIS), 3))
             else:
-                image_group[((_row * GRID_AXIS) + _col)].fill = BLACK
-
-
-def ulab_bilinear_interpolation():
-    """2x bilinear interpolation to upscale the sensor data array; by @v923z
-    and @David.Glaude."""
-    GRID_DATA[1::2, ::2] = SENSOR_DATA[:-1, :]
-    GRID_DATA[1::2, ::2] += SENSOR_DATA[1:, :]
-    GRID_DATA[1::2, ::2] /= 2
-    GRID_DATA[::, 1::2] = GRID_DATA[::, :-1:2]
-    GRID_DATA[::, 1::2] += GRID_DATA[::, 2::2]
-    GRID_DATA[::, 1::2] /= 2
-
-
-# pylint: disable=too-many-branches
-# pylint: disable=too-many-statements
-def setup_mode():
-    """Change alarm threshold and minimum/maximum range values"""
-    status_label.color = WHITE
-    status_label.text = "-SET-"
-
-    ave_label.color = BLACK  # Turn off average label and value display
-    ave_value.color = BLACK
-
-    max_value.text = str(MAX_RANGE_F)  # Display maximum range value
-    min_value.text = str(MIN_RANGE_F)  # Display minimum range value
-
-    time.sleep(0.8)  # Show SET status text before setting parameters
-    status_label.text = ""  # Clear status text
-
-    param_index = 0  # Reset index of parameter to set
-
-    setup_state = "SETUP"  # Set initial state
-    while setup_state == "SETUP":
-        # Select parameter to set
-        setup_state = "SELECT_PARAM"  # Parameter selection state
-        while setup_state == "SELECT_PARAM":
-            param_index = max(0, min(2, param_index))
-            status_label.text = SETUP_COLORS[param_index][0]
-            image_group[param_index + 226].color = BLACK
-            status_label.color = BLACK
-            time.sleep(0.25)
-            image_group[param_index + 226].color = SETUP_COLORS[param_index][1]
-            status_label.color = WHITE
-            time.sleep(0.25)
-
-            param_index -= get_joystick()
-
-            _buttons = panel.events.get()
-            if _buttons and _buttons.pressed:
-                if _buttons.key_number == BUTTON_UP:  # HOLD button pressed
-                    param_index = param_index - 1
-                if _buttons.key_number == BUTTON_DOWN:  # SET button pressed
-                    param_index = param_index + 1
-                if _buttons.key_number == BUTTON_HOLD:  # HOLD button pressed
-                    play_tone(1319, 0.030)  # Musical note E6
-                    setup_state = "ADJUST_VALUE"  # Next state
-                if _buttons.key_number == BUTTON_SET:  # SET button pressed
-                    play_tone(1319, 0.030)  # Musical note E6
-                    setup_state = "EXIT"  # Next state
-
-        # Adjust parameter value
-        param_value = int(image_group[param_index + 230].text)
-
-        while setup_state == "ADJUST_VALUE":
-            param_value = max(32, min(157, param_value))
-            image_group[param_index + 230].text = str(param_value)
-            image_group[param_index + 230].color = BLACK
-            status_label.color = BLACK
-            time.sleep(0.05)
-            image_group[param_index + 230].color = SETUP_COLORS[param_index][1]
-            status_label.color = WHITE
-            time.sleep(0.2)
-
-            param_value += get_joystick()
-
-            _buttons = panel.events.get()
-            if _buttons and _buttons.pressed:
-                if _buttons.key_number == BUTTON_UP:  # HOLD button pressed
-                    param_value = param_value + 1
-                if _buttons.key_number == BUTTON_DOWN:  # SET button pressed
-                    param_value = param_value - 1
-                if _buttons.key_number == BUTTON_HOLD:  # HOLD button pressed
-                    play_tone(1319, 0.030)  # Musical note E6
-                    setup_state = "SETUP"  # Next state
-                if _buttons.key_number == BUTTON_SET:  # SET button pressed
-                    play_tone(1319, 0.030)  # Musical note E6
-                    setup_state = "EXIT"  # Next state
-
-    # Exit setup process
-    status_label.text = "RESUME"
-    time.sleep(0.5)
-    status_label.text = ""
-
-    # Display average label and value
-    ave_label.color = YELLOW
-    ave_value.color = YELLOW
-    return int(alarm_value.text), int(max_value.text), int(min_value.text)
-
-
-def get_joystick():
-    """Read the joystick and interpret as up/down buttons (PyGamer)"""
-    if HAS_JOYSTICK:
-        if joystick_y.value < 20000:
-            # Up
-            return 1
-        if joystick_y.value > 44000:
-            # Down
-            return -1
-    return 0
+                color = BLACK
+            cell = image_group[((_row * GRID_AXIS) + _col)]
+            if not dirty_only or cell.fill != color:
+                cell.fill = color
+
+
+def show_frame():
+    """Draw the frame with the full-frame renderer from the sidebar value and
+    status slots"""
+    status_text = status_label.shown
+    frame.show(
+        [slot.shown for slot in (alarm_value, max_value, ave_value, min_value)],
+        (status_text, status_label.color) if status_text else None,
+    )
+
+
+def set_range(min_f=None, max_f=None, min_c=None, max_c=None):
+    """Set the display range from Fahrenheit or Celsius values and precompute
+    the normalization scale factor; called only when the range changes"""
+    global MIN_RANGE_C, MAX_RANGE_C, MIN_RANGE_F, MAX_RANGE_F  # pylint: disable=global-statement
+    if min_c is None:
+        MIN_RANGE_F, MAX_RANGE_F = min_f, max_f
+        MIN_RANGE_C = f_to_c(min_f)
+        MAX_RANGE_C = f_to_c(max_f)
+    else:
+        MIN_RANGE_C, MAX_RANGE_C = min_c, max(max_c, min_c + 1)  # At least 1 degree
+        MIN_RANGE_F = round(c_to_f(MIN_RANGE_C))
+        MAX_RANGE_F = round(c_to_f(MAX_RANGE_C))
+    core.set_range(MIN_RANGE_C, MAX_RANGE_C)
+    if change:
+        change.force()  # Redraw with the new range
 
 
 play_tone(440, 0.1)  # Musical note A4
 play_tone(880, 0.1)  # Musical note A5
+boot_t1 = boot_phase("tones", boot_t1)
+
+# ### Boot stage 6: define the display group ###
+smooth = None
+frame = None  # The full-frame renderer of a matrix or EVE board
+if hw.renderer == "eve":
+    # The EVE coprocessor draws the image, sidebar, and status from a retained
+    #   display list; its palette ends with black for the histogram background
+    from thermalcamera_eve import EveRenderer
+
+    frame = EveRenderer(
+        display,
+        WIDTH,
+        HEIGHT,
+        PALETTE_LUT + [BLACK],
+        [("alm", WHITE), ("max", RED), ("ave", YELLOW), ("min", CYAN)],
+        grid_axis=GRID_AXIS,
+        selfie=SELFIE,
+        smooth=SMOOTH_RENDER,
+    )
+elif hw.renderer == "matrix":
+    # The whole LED panel is one bitmap that the renderer scales the image into;
+    #   its palette ends with black for the histogram background
+    from thermalcamera_matrix import MatrixRenderer
+
+    frame = MatrixRenderer(
+        WIDTH,
+        HEIGHT,
+        PALETTE_LUT,
+        [WHITE, RED, YELLOW, CYAN],
+        grid_axis=GRID_AXIS,
+        selfie=SELFIE,
+    )
+    image_group = displayio.Group()
+    image_group.append(frame.tile_grid)
+
+if frame:
+    from thermalcamera_slots import Slot, SlotGroup
+
+    # The renderer draws the visible text of the value and status slots; any
+    #   captions are part of the renderer's static layout
+    status_label = Slot()
+    alarm_label = Slot("alm", WHITE)
+    max_label = Slot("max", RED)
+    min_label = Slot("min", CYAN)
+    ave_label = Slot("ave", YELLOW)
+    alarm_value = Slot(ALARM_TEXT, WHITE)
+    max_value = Slot(units.text(MAX_RANGE_C), RED)
+    min_value = Slot(units.text(MIN_RANGE_C), CYAN)
+    ave_value = Slot("---", YELLOW)
+    min_histo = Slot()
+    max_histo = Slot()
+    range_histo = Slot("-RANGE-")
+else:
+    image_group = displayio.Group(scale=1)
+
+    # Define the foundational thermal image grid cells; image_group[0:224]
+    #   image_group[#] = image_group[ (row * GRID_AXIS) + column ]
+    for row in range(GRID_AXIS):
+        for col in range(GRID_AXIS):
+            cell_x = (col * CELL_SIZE) + GRID_X_OFFSET
+            cell_y = row * CELL_SIZE
+            cell = Rect(
+                x=cell_x,
+                y=cell_y,
+                width=CELL_SIZE,
+                height=CELL_SIZE,
+                fill=None,
+                outline=None,
+                stroke=0,
+            )
+            image_group.append(cell)
+
+    # Define the full-resolution smooth image bitmap when enabled; image_group[225]
+    #   (imported only when used; the following image_group indices shift by one)
+    if SMOOTH_RENDER:
+        from thermalcamera_render import SmoothRenderer, build_palette
+
+        smooth = SmoothRenderer(
+            GRID_SIZE,
+            build_palette(PALETTE_LUT),
+            sensor_axis=SENSOR_AXIS,
+            selfie=SELFIE,
+            band=SMOOTH_BAND,
+            x=GRID_X_OFFSET,
+        )
+        image_group.append(smooth.tile_grid)
+    boot_t1 = boot_phase("image cells", boot_t1)
+
+    # Define labels and values
+    status_label = Label(font_0, text="", color=None)
+    status_label.anchor_point = (0.5, 0.5)
+    status_label.anchored_position = ((WIDTH // 2) + (GRID_X_OFFSET // 2), HEIGHT // 2)
+    image_group.append(status_label)  # image_group[225]
+
+    alarm_label = Label(font_0, text="alm", color=WHITE)
+    alarm_label.anchor_point = (0, 0)
+    alarm_label.anchored_position = sidebar_position(0, caption=True)
+    image_group.append(alarm_label)  # image_group[226]
+
+    max_label = Label(font_0, text="max", color=RED)
+    max_label.anchor_point = (0, 0)
+    max_label.anchored_position = sidebar_position(1, caption=True)
+    image_group.append(max_label)  # image_group[227]
+
+    min_label = Label(font_0, text="min", color=CYAN)
+    min_label.anchor_point = (0, 0)
+    min_label.anchored_position = sidebar_position(3, caption=True)
+    image_group.append(min_label)  # image_group[228]
+
+    ave_label = Label(font_0, text="ave", color=YELLOW)
+    ave_label.anchor_point = (0, 0)
+    ave_label.anchored_position = sidebar_position(2, caption=True)
+    image_group.append(ave_label)  # image_group[229]
+
+    alarm_value = DigitLabel(digits, text=ALARM_TEXT, color=WHITE)
+    alarm_value.anchor_point = (0, 0)
+    alarm_value.anchored_position = sidebar_position(0)
+    image_group.append(alarm_value)  # image_group[230]
+
+    max_value = DigitLabel(digits, text=units.text(MAX_RANGE_C), color=RED)
+    max_value.anchor_point = (0, 0)
+    max_value.anchored_position = sidebar_position(1)
+    image_group.append(max_value)  # image_group[231]
+
+    min_value = DigitLabel(digits, text=units.text(MIN_RANGE_C), color=CYAN)
+    min_value.anchor_point = (0, 0)
+    min_value.anchored_position = sidebar_position(3)
+    image_group.append(min_value)  # image_group[232]
+
+    ave_value = DigitLabel(digits, text="---", color=YELLOW)
+    ave_value.anchor_point = (0, 0)
+    ave_value.anchored_position = sidebar_position(2)
+    image_group.append(ave_value)  # image_group[233]
+
+    min_histo = DigitLabel(digits, text="", color=None)
+    min_histo.anchor_point = (0, 0.5)
+    min_histo.anchored_position = (GRID_X_OFFSET, LEGEND_Y)
+    image_group.append(min_histo)  # image_group[234]
+
+    max_histo = DigitLabel(digits, text="", color=None)
+    max_histo.anchor_point = (1, 0.5)
+    max_histo.anchored_position = (WIDTH - 2, LEGEND_Y)
+    image_group.append(max_histo)  # image_group[235]
+
+    range_histo = Label(font_0, text="-RANGE-", color=None)
+    range_histo.anchor_point = (0.5, 0.5)
+    range_histo.anchored_position = ((WIDTH // 2) + (GRID_X_OFFSET // 2), LEGEND_Y)
+    image_group.append(range_histo)  # image_group[236]
+
+status = StatusOverlay(status_label, color=WHITE)
+
+boot_t1 = boot_phase("labels", boot_t1)
+
+# Define the alarm zones and their image outline overlays; image_group[237]
+#   (a full-frame renderer does not draw the outlines)
+zones = ZoneMonitor(ZONES, sensor_axis=SENSOR_AXIS)
+if frame:
+    zone_group = SlotGroup(Slot(outline=WHITE) for _ in zones.zones)
+else:
+    zone_group = displayio.Group()
+    for zone in zones.zones:
+        x_0, y_0, x_1, y_1 = zone.grid_bounds(GRID_AXIS, selfie=SELFIE)
+        zone_group.append(
+            Rect(
+                x=(x_0 * CELL_SIZE) + GRID_X_OFFSET,
+                y=y_0 * CELL_SIZE,
+                width=(x_1 - x_0 + 1) * CELL_SIZE,
+                height=(y_1 - y_0 + 1) * CELL_SIZE,
+                fill=None,
+                outline=WHITE,
+                stroke=1,
+            )
+        )
+    image_group.append(zone_group)
+zone_outlines = [WHITE] * len(zones.zones)  # Current zone outline colors
+
+# Compensate for surface emissivity using the sensor's thermistor temperature
+ambient = AmbientCompensation(amg8833, size=SENSOR_AXIS**2, interval=AMBIENT_INTERVAL)
+ambient.set_zone_emissivity(EMISSIVITY, zones.zones)
+
+# Flat-field calibration captures; the tables were loaded with the settings
+flat_field = None  # Flat-field capture in progress
+last_flat_field = None  # Previous capture average for two-point calibration
+BAD_PIXEL_C = delta_f_to_c(BAD_PIXEL_F)
+
+# The image pipeline: acquire, correct, stats, normalize, and interpolate
+core = ThermalCore(
+    amg8833,
+    axis=SENSOR_AXIS,
+    palette_size=PALETTE_SIZE,
+    calibration=calibration,
+    ambient=ambient,
+)
+core.set_range(MIN_RANGE_C, MAX_RANGE_C)
+stats = core.stats  # Per-frame sensor temperature statistics
+GRID_DATA = core.grid  # Display grid; holds a sample spectrum until the first frame
+
+# Continuous auto-ranging from the percentile statistics
+auto_range = AutoRange(
+    alpha=AUTO_RANGE_ALPHA,
+    max_rate=delta_f_to_c(AUTO_RANGE_RATE_F),
+    min_span=delta_f_to_c(AUTO_RANGE_MIN_SPAN_F),
+)
 
-# ### Define the display group ###
-mkr_t0 = time.monotonic()  # Time marker: Define Display Elements
-image_group = displayio.Group(scale=1)
-
-# Define the foundational thermal image grid cells; image_group[0:224]
-#   image_group[#] = image_group[ (row * GRID_AXIS) + column ]
-for row in range(GRID_AXIS):
-    for col in range(GRID_AXIS):
-        cell_x = (col * CELL_SIZE) + GRID_X_OFFSET
-        cell_y = row * CELL_SIZE
-        cell = Rect(
-            x=cell_x,
-            y=cell_y,
-            width=CELL_SIZE,
-            height=CELL_SIZE,
-            fill=None,
-            outline=None,
-            stroke=0,
+# Accumulate the per-pixel peak or minimum in the hold image modes
+hold = HoldAccumulator()
+
+# Track the per-pixel rate of temperature rise
+rise = RateOfRise(SENSOR_AXIS**2, window=RISE_WINDOW, interval=RISE_INTERVAL)
+RISE_ALARM_C_PER_MIN = delta_f_to_c(RISE_ALARM_F_PER_MIN)
+boot_t1 = boot_phase("zones", boot_t1)
+
+# Define the hotspot markers and ID labels; image_group[238]
+#   (a full-frame renderer does not draw the markers)
+blobs = []
+blob_tracker = BlobTracker()
+BLOB_THRESHOLD_C = f_to_c(BLOB_THRESHOLD_F)
+if frame:
+    blob_group = SlotGroup()
+else:
+    blob_group = displayio.Group()
+    for _ in range(BLOB_MAX):
+        marker = displayio.Group()
+        marker.append(
+            Rect(
+                x=-CELL_SIZE - (CELL_SIZE // 2),
+                y=-CELL_SIZE - (CELL_SIZE // 2),
+                width=3 * CELL_SIZE,
+                height=3 * CELL_SIZE,
+                fill=None,
+                outline=YELLOW,
+                stroke=1,
+            )
         )
-        image_group.append(cell)
-
-# Define labels and values
-status_label = Label(font_0, text="", color=None)
-status_label.anchor_point = (0.5, 0.5)
-status_label.anchored_position = ((WIDTH // 2) + (GRID_X_OFFSET // 2), HEIGHT // 2)
-image_group.append(status_label)  # image_group[225]
-
-alarm_label = Label(font_0, text="alm", color=WHITE)
-alarm_label.anchor_point = (0, 0)
-alarm_label.anchored_position = (1, 16)
-image_group.append(alarm_label)  # image_group[226]
-
-max_label = Label(font_0, text="max", color=RED)
-max_label.anchor_point = (0, 0)
-max_label.anchored_position = (1, 46)
-image_group.append(max_label)  # image_group[227]
-
-min_label = Label(font_0, text="min", color=CYAN)
-min_label.anchor_point = (0, 0)
-min_label.anchored_position = (1, 106)
-image_group.append(min_label)  # image_group[228]
-
-ave_label = Label(font_0, text="ave", color=YELLOW)
-ave_label.anchor_point = (0, 0)
-ave_label.anchored_position = (1, 76)
-image_group.append(ave_label)  # image_group[229]
-
-alarm_value = Label(font_0, text=str(ALARM_F), color=WHITE)
-alarm_value.anchor_point = (0, 0)
-alarm_value.anchored_position = (1, 5)
-image_group.append(alarm_value)  # image_group[230]
-
-max_value = Label(font_0, text=str(MAX_RANGE_F), color=RED)
-max_value.anchor_point = (0, 0)
-max_value.anchored_position = (1, 35)
-image_group.append(max_value)  # image_group[231]
-
-min_value = Label(font_0, text=str(MIN_RANGE_F), color=CYAN)
-min_value.anchor_point = (0, 0)
-min_value.anchored_position = (1, 95)
-image_group.append(min_value)  # image_group[232]
-
-ave_value = Label(font_0, text="---", color=YELLOW)
-ave_value.anchor_point = (0, 0)
-ave_value.anchored_position = (1, 65)
-image_group.append(ave_value)  # image_group[233]
-
-min_histo = Label(font_0, text="", color=None)
-min_histo.anchor_point = (0, 0.5)
-min_histo.anchored_position = (GRID_X_OFFSET, 121)
-image_group.append(min_histo)  # image_group[234]
-
-max_histo = Label(font_0, text="", color=None)
-max_histo.anchor_point = (1, 0.5)
-max_histo.anchored_position = (WIDTH - 2, 121)
-image_group.append(max_histo)  # image_group[235]
-
-range_histo = Label(font_0, text="-RANGE-", color=None)
-range_histo.anchor_point = (0.5, 0.5)
-range_histo.anchored_position = ((WIDTH // 2) + (GRID_X_OFFSET // 2), 121)
-image_group.append(range_histo)  # image_group[236]
+        marker_id = DigitLabel(digits, text="", color=YELLOW, max_chars=3)
+        marker_id.anchor_point = (0, 1)
+        marker_id.anchored_position = (CELL_SIZE + (CELL_SIZE // 2), -CELL_SIZE)
+        marker.append(marker_id)
+        marker.hidden = True
+        blob_group.append(marker)
+    image_group.append(blob_group)
+boot_t1 = boot_phase("hotspots", boot_t1)
+
+# Histogram-equalized color mapping is imported only when enabled
+equalizer = None
+if EQUALIZE:
+    from thermalcamera_equalize import HistogramEqualizer
+
+    equalizer = HistogramEqualizer(alpha=EQUALIZE_ALPHA)
+
+# Static scene frame skipping is imported only when enabled
+change = None
+if CHANGE_DETECT:
+    from thermalcamera_change import ChangeDetector
+
+    change = ChangeDetector(
+        threshold=delta_f_to_c(CHANGE_THRESHOLD_F),
+        max_threshold=delta_f_to_c(4 * CHANGE_THRESHOLD_F),
+        heartbeat=CHANGE_HEARTBEAT,
+    )
+
+# Frame-time quality governor is imported only when enabled
+governor = None
+if QUALITY_GOVERNOR and TARGET_FRAME_TIME:
+    from thermalcamera_quality import QualityGovernor
+
+    governor = QualityGovernor(target=TARGET_FRAME_TIME, interval=QUALITY_INTERVAL)
+
+# Battery power management is imported only when enabled
+power = None
+if POWER_SAVE:
+    from thermalcamera_power import PowerManager
+
+    power = PowerManager(
+        amg8833,
+        display,
+        idle_time=IDLE_TIME,
+        sleep_time=SLEEP_TIME,
+        dim_brightness=DIM_BRIGHTNESS,
+        int_pin=getattr(board, SENSOR_INT_PIN) if SENSOR_INT_PIN else None,
+    )
+    # The sensor interrupt wakes the camera at the lowest alarm threshold
+    power.set_wake_threshold(min([ALARM_C] + [zone.alarm_c for zone in zones.zones]))
+
+# Setup mode is rarely used; it is imported and built on first use
+setup = None
+
+
+def start_setup():
+    """Build setup mode on first use, then start it with the current values"""
+    global setup  # pylint: disable=global-statement
+    if setup is None:
+        from thermalcamera_setup import SetupMode, SetupParam
+
+        # Define the setup mode parameters, listed in on-screen order
+        setup = SetupMode(
+            [
+                SetupParam("ALARM", alarm_label, alarm_value, WHITE),
+                SetupParam("RANGE", max_label, max_value, RED),
+                SetupParam("RANGE", min_label, min_value, CYAN),
+            ],
+            status,
+            {
+                "up": BUTTON_UP,
+                "down": BUTTON_DOWN,
+                "enter": BUTTON_HOLD,
+                "exit": BUTTON_SET,
+                "calibrate": BUTTON_FOCUS,
+            },
+            value_range=(units.from_fahrenheit(32), units.from_fahrenheit(157)),
+            click=lambda: play_tone(1319, 0.030),  # Musical note E6
+            hide=[(ave_label, YELLOW), (ave_value, YELLOW)],  # Not settable
+        )
+    setup.enter(
+        [units.from_fahrenheit(value) for value in (ALARM_F, MAX_RANGE_F, MIN_RANGE_F)]
+    )
+
 
 # ###--- PRIMARY PROCESS SETUP ---###
-mkr_t1 = time.monotonic()  # Time marker: Primary Process Setup
 # pylint: disable=no-member
 mem_fm1 = gc.mem_free()  # Monitor free memory
 DISPLAY_IMAGE = True  # Image display mode; False for histogram
+ACCUMULATE = None  # Image accumulation mode; None, PEAK, or MIN
 DISPLAY_HOLD = False  # Active display mode; True to hold display
-DISPLAY_FOCUS = False  # Standard display range; True to focus display range
+RANGE_MODE = "ORIG"  # Display range mode; "ORIG", "FOCUS", or "AUTO"
+SMOOTH = smooth is not None  # Smooth image in use; the governor may suspend it
 
 # pylint: disable=invalid-name
 orig_max_range_f = 0  # Establish temporary range variables
 orig_min_range_f = 0
 
 # Activate display, show preloaded sample spectrum, and play welcome tone
-display.root_group = image_group
-update_image_frame()
-flash_status("IRON", 0.75)
+if hw.renderer != "eve":
+    display.root_group = image_group
+update_image_frame(GRID_DATA)
+if smooth:
+    smooth.render(SENSOR_DATA / (SENSOR_AXIS**2))
+status.post("IRON", 0.75)
 play_tone(880, 0.010)  # Musical note A5
+if frame:
+    show_frame()
+scheduler.refresh()
+boot_t1 = boot_phase("activate", boot_t1)
+BOOT_TIME = boot_t1 - boot_t0
+# tools/simulate_boards.py runs this boot on the host and checks the same limit
+if BOOT_TIME > BOOT_TIME_LIMIT:
+    print(f"*** Boot time {BOOT_TIME:6.3f} sec exceeds {BOOT_TIME_LIMIT} sec limit")
 
 # ###--- PRIMARY PROCESS LOOP ---###
 while True:
     mkr_t2 = time.monotonic()  # Time marker: Acquire Sensor Data
-    if DISPLAY_HOLD:
-        flash_status("-HOLD-", 0.25)
-    else:
-        sensor = amg8833.pixels  # Get sensor_data data
-    # Put sensor data in array; limit to the range of 0, 80
-    SENSOR_DATA = np.clip(np.array(sensor), 0, 80)
+    # Acquire and correct pixel gain, offset, and bad pixels, then compensate
+    #   for surface emissivity; limit to the range of 0, 80
+    SENSOR_DATA = core.acquire(hold=DISPLAY_HOLD)
+
+    # Average uncorrected frames of a uniform scene for flat-field calibration
+    if flat_field and not DISPLAY_HOLD and flat_field.add(core.raw):
+        calibration.flat_field(
+            flat_field.average, last_flat_field, bad_threshold=BAD_PIXEL_C
+        )
+        settings.set("calibration", calibration.pack())
+        last_flat_field = flat_field.average
+        flat_field = None
+        status.clear("CAL")
+        status.post("SAVED", 0.75, PRIORITY_INFO)
+
+    # Accumulate every frame in the peak- and min-hold image modes
+    if ACCUMULATE:
+        hold.update(SENSOR_DATA)
+
+    # Frames of a static scene skip the stats, image, and label updates
+    PROCESS = change.update(SENSOR_DATA) if change else True
+    # At reduced quality, stats and labels are updated every few frames
+    STATS = PROCESS and (not governor or governor.stats)
+    LABELS = PROCESS and (not governor or governor.labels)
 
     # Update and display alarm setting and max, min, and ave stats
     mkr_t4 = time.monotonic()  # Time marker: Display Statistics
-    v_max = np.max(SENSOR_DATA)
-    v_min = np.min(SENSOR_DATA)
-    v_ave = np.mean(SENSOR_DATA)
-
-    alarm_value.text = str(ALARM_F)
-    max_value.text = str(celsius_to_fahrenheit(v_max))
-    min_value.text = str(celsius_to_fahrenheit(v_min))
-    ave_value.text = str(celsius_to_fahrenheit(v_ave))
+    if STATS:
+        core.update_stats()
+
+    if LABELS and not (setup and setup.active):
+        # Setup mode displays the values being adjusted instead
+        alarm_value.text = ALARM_TEXT
+        max_value.text = units.text(stats.max)
+        min_value.text = units.text(stats.min)
+        ave_value.text = units.text(stats.mean)
+
+    # Update alarm zone statistics, alarm states, and outline colors
+    zone_alarms = zones.update(SENSOR_DATA)
+    for index, zone in enumerate(zones.zones):
+        outline = RED if zone.alarm else WHITE
+        if zone_outlines[index] != outline:
+            zone_outlines[index] = outline
+            zone_group[index].outline = outline
+
+    # Sample the rate of rise; a held display has no new sensor data
+    if not DISPLAY_HOLD:
+        rise.update(SENSOR_DATA)
+
+    # Track the display range continuously in auto-range mode
+    if RANGE_MODE == "AUTO" and not DISPLAY_HOLD and STATS:
+        if auto_range.update(stats.p5, stats.p95):
+            set_range(min_c=auto_range.low, max_c=auto_range.high)
 
     # Normalize temperature to index values and interpolate
     mkr_t5 = time.monotonic()  # Time marker: Normalize and Interpolate
-    SENSOR_DATA = (SENSOR_DATA - MIN_RANGE_C) / (MAX_RANGE_C - MIN_RANGE_C)
-    GRID_DATA[::2, ::2] = SENSOR_DATA  # Copy sensor data to the grid array
-    ulab_bilinear_interpolation()  # Interpolate to produce 15x15 result
+    if PROCESS:
+        # Interpolate to produce 15x15 result
+        SENSOR_DATA = core.interpolate(
+            coarse=bool(governor and governor.coarse),
+            data=hold.buffer if ACCUMULATE else None,
+        )
+
+        # Detect, track, and mark hotspots in the interpolated grid
+        if BLOB_DETECT:
+            blobs = find_blobs(
+                GRID_DATA,
+                core.normalize_value(BLOB_THRESHOLD_C),
+                min_area=BLOB_MIN_AREA,
+            )[:BLOB_MAX]
+            blob_tracker.update(blobs)
+            for index, marker in enumerate(blob_group):
+                marker.hidden = index >= len(blobs) or not DISPLAY_IMAGE
+                if not marker.hidden:
+                    blob_row, blob_col = blobs[index].centroid
+                    if not SELFIE:
+                        blob_col = GRID_AXIS - 1 - blob_col
+                    marker.x = GRID_X_OFFSET + int((blob_col + 0.5) * CELL_SIZE)
+                    marker.y = int((GRID_AXIS - 0.5 - blob_row) * CELL_SIZE)
+                    marker[1].text = str(blobs[index].id)
 
     # Display image or histogram
     mkr_t6 = time.monotonic()  # Time marker: Display Image
-    if DISPLAY_IMAGE:
-        update_image_frame(selfie=SELFIE)
-    else:
-        update_histo_frame()
-
-    # If alarm threshold is reached, flash NeoPixels and play alarm tone
-    if v_max >= ALARM_C:
-        pixels.fill(RED)
+    if PROCESS:
+        if DISPLAY_IMAGE and equalizer:
+            # Map through the equalization lookup table; held images keep theirs
+            if not DISPLAY_HOLD:
+                equalizer.update(SENSOR_DATA)
+            if SMOOTH:
+                smooth.render(equalizer.apply(SENSOR_DATA))
+            else:
+                update_image_frame(equalizer.apply(GRID_DATA), selfie=SELFIE)
+        elif DISPLAY_IMAGE and SMOOTH:
+            smooth.render(SENSOR_DATA)
+        elif DISPLAY_IMAGE:
+            update_image_frame(GRID_DATA, selfie=SELFIE)
+        else:
+            update_histo_frame(dirty_only=bool(governor and not governor.smooth))
+        if change:
+            change.record(time.monotonic() - mkr_t4)
+
+    # If alarm threshold is reached, flash NeoPixels and play alarm tone;
+    #   frames without stats check their own maximum rather than the last stats
+    alarms = (stats.max if STATS else np.max(core.data)) >= ALARM_C
+    if alarms:
+        status.post("ALARM", 0.5, PRIORITY_ALARM, color=RED)
+        hw.leds(RED)
         play_tone(880, 0.015)  # Musical note A5
-        pixels.fill(BLACK)
-
-    # See if a panel button is pressed
-    buttons = panel.events.get()
-    if buttons and buttons.pressed:
-        if buttons.key_number == BUTTON_HOLD:
+        hw.leds(BLACK)
+
+    # If the rate-of-rise limit is reached, flash NeoPixels and play rise tone
+    if rise.ready and rise.max_rate >= RISE_ALARM_C_PER_MIN:
+        alarms = True
+        status.post("RISE", 0.5, PRIORITY_ALARM, color=ORANGE)
+        hw.leds(ORANGE)
+        play_tone(1047, 0.015)  # Musical note C6
+        hw.leds(BLACK)
+
+    # If a zone is in alarm, flash the zone's NeoPixel and play its alarm tone
+    for zone in zone_alarms:
+        index = zones.zones.index(zone)
+        status.post(zone.name, 0.5, PRIORITY_ALARM, color=RED)
+        hw.leds(RED, index)
+        play_tone(zone.tone, 0.015)
+        hw.leds(BLACK)
+
+    # Process all pending panel button events
+    key_pressed = False
+    while True:
+        buttons = hw.events.get()
+        if not buttons:
+            break
+        key_pressed = key_pressed or buttons.pressed
+        if buttons.pressed and change:
+            change.force()  # Show the result of the key press
+        if not buttons.pressed or (setup and setup.handle_key(buttons.key_number)):
+            continue
+        if buttons.key_number == BUTTON_HOLD and ACCUMULATE:
+            # Restart the peak or minimum accumulation
+            play_tone(1319, 0.030)  # Musical note E6
+            hold.reset()
+            status.post("RESET", 0.4, PRIORITY_INFO)
+        elif buttons.key_number == BUTTON_HOLD:
             # Toggle display hold (shutter)
             play_tone(1319, 0.030)  # Musical note E6
             DISPLAY_HOLD = not DISPLAY_HOLD
+            if DISPLAY_HOLD:
+                status.post("-HOLD-", None, PRIORITY_HOLD, blink=0.25)
+            else:
+                status.clear("-HOLD-")
+                rise.reset()  # The held frames were not sampled
 
         if buttons.key_number == BUTTON_IMAGE:
-            # Toggle image/histogram mode (display image)
+            # Cycle image, peak-hold image, min-hold image, and histogram modes
             play_tone(659, 0.030)  # Musical note E5
-            DISPLAY_IMAGE = not DISPLAY_IMAGE
+            if DISPLAY_IMAGE and not ACCUMULATE:
+                ACCUMULATE = PEAK
+            elif ACCUMULATE == PEAK:
+                ACCUMULATE = MIN
+            elif ACCUMULATE == MIN:
+                ACCUMULATE = None
+                DISPLAY_IMAGE = False
+            else:
+                DISPLAY_IMAGE = True
+            if ACCUMULATE:
+                hold.reset(ACCUMULATE)  # Each hold mode starts from the live image
+                status.post(ACCUMULATE, 0.4, PRIORITY_INFO)
+            zone_group.hidden = not DISPLAY_IMAGE
+            if smooth:
+                smooth.tile_grid.hidden = not (DISPLAY_IMAGE and SMOOTH)
 
             if DISPLAY_IMAGE:
                 min_histo.color = None
@@ -453,55 +892,152 @@ while True:
                 max_histo.color = RED
                 range_histo.color = BLUE
 
-        if buttons.key_number == BUTTON_FOCUS:  # Toggle display focus mode
+        if buttons.key_number == BUTTON_FOCUS:  # Cycle display range mode
             play_tone(698, 0.030)  # Musical note F5
-            DISPLAY_FOCUS = not DISPLAY_FOCUS
-            if DISPLAY_FOCUS:
-                # Set range values to image min/max for focused image display
+            if RANGE_MODE == "ORIG":
+                # Set range values to the image's 5th to 95th percentile span
+                #   for focused image display; ignores outlier pixels
+                RANGE_MODE = "FOCUS"
                 orig_min_range_f = MIN_RANGE_F
                 orig_max_range_f = MAX_RANGE_F
-                MIN_RANGE_F = celsius_to_fahrenheit(v_min)
-                MAX_RANGE_F = celsius_to_fahrenheit(v_max)
-                # Update range min and max values in Celsius
-                MIN_RANGE_C = v_min
-                MAX_RANGE_C = v_max
-                flash_status("FOCUS", 0.2)
+                set_range(min_c=stats.p5, max_c=stats.p95)
+                status.post("FOCUS", 0.4, PRIORITY_INFO)
+            elif RANGE_MODE == "FOCUS":
+                # Continuously track the percentile span from the focused range
+                RANGE_MODE = "AUTO"
+                auto_range.reset(MIN_RANGE_C, MAX_RANGE_C)
+                status.post("AUTO", 0.4, PRIORITY_INFO)
             else:
                 # Restore previous (original) range values for image display
-                MIN_RANGE_F = orig_min_range_f
-                MAX_RANGE_F = orig_max_range_f
-                # Update range min and max values in Celsius
-                MIN_RANGE_C = fahrenheit_to_celsius(MIN_RANGE_F)
-                MAX_RANGE_C = fahrenheit_to_celsius(MAX_RANGE_F)
-                flash_status("ORIG", 0.2)
+                RANGE_MODE = "ORIG"
+                set_range(orig_min_range_f, orig_max_range_f)
+                status.post("ORIG", 0.4, PRIORITY_INFO)
 
         if buttons.key_number == BUTTON_SET:
             # Activate setup mode
             play_tone(784, 0.030)  # Musical note G5
-
-            # Invoke startup helper; update alarm and range values
-            ALARM_F, MAX_RANGE_F, MIN_RANGE_F = setup_mode()
-            ALARM_C = fahrenheit_to_celsius(ALARM_F)
-            MIN_RANGE_C = fahrenheit_to_celsius(MIN_RANGE_F)
-            MAX_RANGE_C = fahrenheit_to_celsius(MAX_RANGE_F)
+            start_setup()
+
+    # Advance setup mode and apply adjusted alarm and range values immediately
+    if setup:
+        setup.update(hw.joystick())
+        hw.set_input_layout("setup" if setup.active else "main")
+    if setup and setup.calibrate:
+        # Point the camera at a uniform scene; frames are captured while shown
+        setup.calibrate = False
+        flat_field = FlatFieldCapture(CALIBRATION_FRAMES, axis=SENSOR_AXIS)
+        status.post("CAL", None, PRIORITY_SETUP, blink=0.25)
+    if setup and setup.changed:
+        setup.changed = False
+        # Convert only the changed values; an unchanged Celsius value keeps its
+        #   Fahrenheit setting rather than drifting by a degree of rounding
+        ALARM_F, max_range_f, min_range_f = (
+            f if value == units.from_fahrenheit(f) else units.to_fahrenheit(value)
+            for value, f in zip(setup.values, (ALARM_F, MAX_RANGE_F, MIN_RANGE_F))
+        )
+        ALARM_C = f_to_c(ALARM_F)
+        ALARM_TEXT = str(units.from_fahrenheit(ALARM_F))
+        if power:
+            power.set_wake_threshold(
+                min([ALARM_C] + [zone.alarm_c for zone in zones.zones])
+            )
+        # A manually set range replaces the focused or automatic range
+        RANGE_MODE = "ORIG"
+        set_range(min_range_f, max_range_f)
+        settings.set("alarm_f", ALARM_F)
+        settings.set("min_range_f", MIN_RANGE_F)
+        settings.set("max_range_f", MAX_RANGE_F)
+
+    # Step the sensor, backlight, and CPU power down while nothing happens
+    if power:
+        power.update(core.data, alarm=alarms or bool(zone_alarms), key=key_pressed)
+
+    status.service()  # Show, blink, or remove scheduled status messages
+    settings.service()  # Store changed settings once changes have settled
+    if frame:
+        show_frame()  # Draw the values and status over the latest image
+    scheduler.refresh()  # Push the completed frame to the display
 
     mkr_t7 = time.monotonic()  # Time marker: End of Primary Process
+    # Frame time without the refresh wait; the wait may absorb the whole frame
+    #   time, so the result is at least the monotonic clock's resolution
+    work_time = max(mkr_t7 - mkr_t2 - scheduler.wait_time, 0.001)
+
+    # Step image quality down when late and back up when there is headroom
+    if governor and governor.update(work_time):
+        if smooth:
+            SMOOTH = governor.smooth
+            smooth.tile_grid.hidden = not (DISPLAY_IMAGE and SMOOTH)
+        if change:
+            change.force()  # Redraw at the new quality level
     gc.collect()
     mem_fm7 = gc.mem_free()
 
     # Print frame performance report
     print("*** PyBadge/Gamer Performance Stats ***")
-    print(f"  define display: {(mkr_t1 - mkr_t0):6.3f} sec")
+    print(f"  font load:      {font_load_time:6.3f} sec  {font_file}")
+    print(f"  glyph preload:  {font_preload_time:6.3f} sec")
+    for phase, duration in BOOT_PHASES:
+        print(f"  boot {phase + ':':12s}{duration:6.3f} sec")
+    print(f"  boot total:      {BOOT_TIME:6.3f} sec")
     print(f"  free memory:    {mem_fm1 / 1000:6.3f} Kb")
     print("")
     print("                          rate")
     print(f" 1) acquire: {(mkr_t4 - mkr_t2):6.3f} sec  ", end="")
-    print(f"{(1 / (mkr_t4 - mkr_t2)):5.1f}  /sec")
+    print(f"{rate(mkr_t4 - mkr_t2):5.1f}  /sec")
     print(f" 2) stats:   {(mkr_t5 - mkr_t4):6.3f} sec")
     print(f" 3) convert: {(mkr_t6 - mkr_t5):6.3f} sec")
     print(f" 4) display: {(mkr_t7 - mkr_t6):6.3f} sec")
+    print(f"    refresh: {scheduler.refresh_time:6.3f} sec")
+    print(f"    wait:    {scheduler.wait_time:6.3f} sec")
+    if DISPLAY_IMAGE and SMOOTH:
+        print(f"    smooth:  {smooth.render_time:6.3f} sec  ", end="")
+        print(f"{smooth.max_rate:5.1f}  /sec")
+    if hw.renderer == "matrix":
+        print(f"    matrix:  {frame.render_time:6.3f} sec")
     print("             =======")
     print(f"total frame: {(mkr_t7 - mkr_t2):6.3f} sec  ", end="")
-    print(f"{(1 / (mkr_t7 - mkr_t2)):5.1f}   /sec")
+    print(f"{rate(mkr_t7 - mkr_t2):5.1f}   /sec")
+    print(f"  sustainable: {work_time:6.3f} sec  ", end="")
+    print(f"{rate(work_time):5.1f}   /sec")
+    if governor:
+        print(f"  quality: {governor.name:6s} level {governor.level}  ", end="")
+        print(f"frame {governor.frame_time:6.3f} sec  ", end="")
+        print(f"target {governor.target:6.3f} sec  changes {governor.changes}")
+    if ACCUMULATE:
+        print(f"  hold: {ACCUMULATE:4s}  {hold.frames:5d} frames  ", end="")
+        print(f"{hold.elapsed:6.1f} sec")
+    if change:
+        print(f"  static skip: {change.skip_ratio * 100:5.1f} % of frames  ", end="")
+        print(f"saved {change.saved_time:6.1f} sec  ", end="")
+        print(f"threshold {units.delta(change.threshold):4.1f} {units.name}", end="")
+        print("" if PROCESS else "  (skipped)")
+    print(f"  rate of rise: {units.delta(rise.max_rate):6.1f} {units.name}/min", end="")
+    print("" if rise.ready else "  (filling)")
+    print(f"  sensor: max {units.text(stats.max)} {units.name} ", end="")
+    print(f"at {stats.max_loc}  ", end="")
+    print(f"min {units.text(stats.min)} {units.name} at {stats.min_loc}")
+    print(f"          mean {units.text(stats.mean)} {units.name}  ", end="")
+    print(f"std {units.delta(stats.std):4.1f} {units.name}  ", end="")
+    print(f"p5-p95 {units.text(stats.p5)}-{units.text(stats.p95)} {units.name}")
+    if not calibration.identity:
+        print(f"  calibrated: bad pixels {calibration.bad}")
+    if not ambient.identity and ambient.ambient is not None:
+        print(f"  ambient: {units.text(ambient.ambient)} {units.name}")
+    for blob in blobs:
+        blob_row, blob_col = blob.centroid
+        print(f"  hotspot {blob.id}: {blob.area:3d} cells  ", end="")
+        peak = (blob.peak / core.scale) + MIN_RANGE_C
+        print(f"peak {units.text(peak)} {units.name}  ", end="")
+        print(f"at ({blob_row:4.1f}, {blob_col:4.1f})  bounds {tuple(blob.bounds)}")
+    if power:
+        print(f"  power: {power.state:6s}  ", end="")
+        print(f"cpu awake {power.cpu_duty * 100:5.1f} %  ", end="")
+        print(f"backlight {power.backlight_duty * 100:5.1f} %  ", end="")
+        print(f"sensor stand-by {power.sensor_sleep * 100:5.1f} %")
     print(f"           free memory:   {mem_fm7 / 1000:6.3f} Kb")
     print("")
+
+    # Sleep until the next frame while idle
+    if power:
+        power.pause()
@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_agc`
+================================================================================
+Continuous auto-ranging (automatic gain control) helper.
+
+Tracks a target display range, typically the 5th to 95th percentile span of each
+frame, with exponential smoothing and a limit on how fast either end of the
+range may move so that image colors do not pump as the scene changes.
+"""
+
+import time
+
+
+class AutoRange:
+    """Smoothed, rate-limited display range tracker.
+
+    :param float alpha: Exponential smoothing factor (0 to 1); higher values
+      follow the target faster. Defaults to 0.2.
+    :param float max_rate: Maximum range change in degrees per second.
+      Defaults to 2.0.
+    :param float min_span: Minimum range span in degrees. Defaults to 2.0.
+    :param float threshold: Smallest change that is reported as a range change;
+      avoids recalculating range-dependent constants for negligible changes.
+      Defaults to 0.05.
+    """
+
+    def __init__(self, alpha=0.2, max_rate=2.0, min_span=2.0, threshold=0.05):
+        self.alpha = alpha
+        self.max_rate = max_rate
+        self.min_span = min_span
+        self._threshold = threshold
+        self.low = 0
+        self.high = min_span
+        self._reported = (self.low, self.high)
+        self._last = None
+
+    def reset(self, low, high):
+        """Start tracking from a known range."""
+        self.low = low
+        self.high = high
+        self._reported = (low, high)
+        self._last = None
+
+    def update(self, low, high, now=None):
+        """Move the range toward the target low and high values. Returns True
+        when the range has changed by more than the reporting threshold."""
+        if now is None:
+            now = time.monotonic()
+        step = self.max_rate * (now - self._last) if self._last else 0
+        self._last = now
+        self.low = self._approach(self.low, low, step)
+        self.high = self._approach(self.high, high, step)
+        if self.high - self.low < self.min_span:
+            center = (self.high + self.low) / 2
+            self.low = center - (self.min_span / 2)
+            self.high = center + (self.min_span / 2)
+        if (
+            abs(self.low - self._reported[0]) < self._threshold
+            and abs(self.high - self._reported[1]) < self._threshold
+        ):
+            return False
+        self._reported = (self.low, self.high)
+        return True
+
+    def _approach(self, value, target, step):
+        change = self.alpha * (target - value)
+        return value + max(-step, min(step, change))
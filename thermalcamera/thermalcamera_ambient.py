@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_ambient`
+================================================================================
+Ambient temperature and emissivity compensation helper.
+
+A surface with an emissivity below 1.0 emits less than a black body at the same
+temperature and reflects some of the surrounding (ambient) radiation, so the
+sensor reads low for a hot surface. Linearizing the gray-body relationship
+gives a per-pixel correction::
+
+    apparent = (emissivity * surface) + ((1 - emissivity) * ambient)
+    surface = (apparent / emissivity) - (ambient * (1 - emissivity) / emissivity)
+
+The ambient temperature comes from the AMG8833's on-board thermistor, read at a
+low rate and cached. The per-pixel gain and offset arrays are recalculated only
+when the thermistor reading or the emissivity changes; each frame is corrected
+with one vectorized multiply-add.
+"""
+
+import time
+from ulab import numpy as np
+
+
+class AmbientCompensation:
+    """Thermistor-referenced per-pixel emissivity compensation.
+
+    :param sensor: The ``adafruit_amg88xx.AMG88XX`` sensor object.
+    :param float emissivity: Default surface emissivity (0.1 to 1.0); 1.0 makes
+      no correction. Defaults to 1.0.
+    :param int size: Number of sensor pixels. Defaults to 64.
+    :param float interval: Thermistor reading interval in seconds.
+      Defaults to 10.
+    :param float resolution: Smallest thermistor change in degrees Celsius that
+      recalculates the compensation. Defaults to 0.25.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, sensor, emissivity=1.0, size=64, interval=10, resolution=0.25):
+        self._sensor = sensor
+        self._size = size
+        self._interval = interval
+        self._resolution = resolution
+        self._next_read = 0
+        self.ambient = None  # Cached thermistor temperature in Celsius
+        self.identity = True  # True when no pixel is corrected
+        self._gain = np.ones(size)
+        self._offset = np.zeros(size)
+        self.set_emissivity([emissivity] * size)
+
+    def set_emissivity(self, emissivity):
+        """Set the per-pixel emissivity from a list of ``size`` values."""
+        self._emissivity = np.clip(np.array(emissivity), 0.1, 1.0)
+        self.identity = np.min(self._emissivity) >= 1.0
+        self._recalculate()
+
+    def set_zone_emissivity(self, emissivity, zones):
+        """Set the default emissivity and override it with the emissivity of
+        each zone that has one; later zones take precedence."""
+        pixels = [emissivity] * self._size
+        for zone in zones:
+            if zone.emissivity is not None:
+                for index, included in enumerate(zone.mask):
+                    if included:
+                        pixels[index] = zone.emissivity
+        self.set_emissivity(pixels)
+
+    def update(self, now=None):
+        """Read the thermistor if the interval has elapsed; returns True if the
+        compensation was recalculated."""
+        if self.identity:
+            return False
+        if now is None:
+            now = time.monotonic()
+        if now < self._next_read:
+            return False
+        self._next_read = now + self._interval
+        ambient = self._sensor.temperature
+        if self.ambient is not None and abs(ambient - self.ambient) < self._resolution:
+            return False
+        self.ambient = ambient
+        self._recalculate()
+        return True
+
+    def apply(self, data):
+        """Compensate a frame of sensor data; returns a new array of the same
+        shape or the original array if no pixel is corrected."""
+        if self.identity or self.ambient is None:
+            return data
+        flat = (data.reshape((self._size,)) * self._gain) + self._offset
+        return flat.reshape(data.shape)
+
+    def _recalculate(self):
+        self._gain = 1 / self._emissivity
+        if self.ambient is not None:
+            self._offset = self.ambient * (1 - self._gain)
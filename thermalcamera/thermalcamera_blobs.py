@@ -0,0 +1,141 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_blobs`
+================================================================================
+Hotspot (blob) detection and tracking helpers.
+
+Thresholds the interpolated grid data and labels connected hot regions with
+run-based connected component labeling: each row is scanned once for runs of
+hot cells and runs that touch a run in the previous row are merged with a small
+union-find table. Per-run peaks are taken with vectorized slices of the grid.
+Blobs are tracked between frames by nearest centroid so that a moving hot
+object keeps its ID.
+"""
+
+from ulab import numpy as np
+
+
+class Blob:
+    """A connected region of hot grid cells.
+
+    :param int row: The first row of the blob.
+    :param int col: The first column of the blob.
+    """
+
+    def __init__(self, row, col):
+        self.id = 0  # Tracking ID; assigned by BlobTracker
+        self.area = 0  # Number of grid cells
+        self.peak = 0  # Peak grid value
+        self.bounds = [col, row, col, row]  # First column, first row, last column, last row
+        self._sum_row = 0
+        self._sum_col = 0
+
+    @property
+    def centroid(self):
+        """The blob's (row, column) centroid in grid cells."""
+        return self._sum_row / self.area, self._sum_col / self.area
+
+    def add_run(self, row, start, end, peak):
+        """Add a run of cells from start to end (inclusive) in a row."""
+        length = end - start + 1
+        self.area += length
+        self._sum_row += row * length
+        self._sum_col += (start + end) * length / 2
+        self.peak = max(self.peak, peak)
+        self.bounds[0] = min(self.bounds[0], start)
+        self.bounds[1] = min(self.bounds[1], row)
+        self.bounds[2] = max(self.bounds[2], end)
+        self.bounds[3] = max(self.bounds[3], row)
+
+
+def _find(parent, label):
+    while parent[label] != label:
+        parent[label] = parent[parent[label]]  # Path halving
+        label = parent[label]
+    return label
+
+
+def find_blobs(grid, threshold, min_area=1):
+    """Label 8-connected regions of grid cells at or above threshold. Returns a
+    list of ``Blob`` objects ordered by descending peak value."""
+    axis = grid.shape[1]
+    hot = grid >= threshold
+    parent = []  # Union-find table of run labels
+    runs = []  # (row, start, end, label) for every run
+    previous = []  # Runs in the previous row
+    for row in range(grid.shape[0]):
+        cells = hot[row].tolist()
+        current = []
+        col = 0
+        while col < axis:
+            if not cells[col]:
+                col += 1
+                continue
+            start = col
+            while col < axis and cells[col]:
+                col += 1
+            end = col - 1
+            label = len(parent)
+            parent.append(label)
+            for _, prev_start, prev_end, prev_label in previous:
+                if prev_start <= end + 1 and prev_end >= start - 1:
+                    root, prev_root = _find(parent, label), _find(parent, prev_label)
+                    if root != prev_root:
+                        parent[max(root, prev_root)] = min(root, prev_root)
+            run = (row, start, end, label)
+            current.append(run)
+            runs.append(run)
+        previous = current
+
+    blobs = {}
+    for row, start, end, label in runs:
+        root = _find(parent, label)
+        if root not in blobs:
+            blobs[root] = Blob(row, start)
+        blobs[root].add_run(row, start, end, np.max(grid[row, start : end + 1]))
+    found = [blob for blob in blobs.values() if blob.area >= min_area]
+    found.sort(key=lambda blob: blob.peak, reverse=True)
+    return found
+
+
+class BlobTracker:
+    """Assign persistent IDs to blobs by nearest-centroid matching.
+
+    :param float max_distance: Maximum centroid movement in grid cells between
+      frames for a blob to keep its ID. Defaults to 3.
+    :param int max_missing: Number of frames a track is kept without a matching
+      blob. Defaults to 3.
+    """
+
+    def __init__(self, max_distance=3, max_missing=3):
+        self._max_distance_sq = max_distance**2
+        self._max_missing = max_missing
+        self._tracks = []  # [id, row, col, missing frames]
+        self._next_id = 1
+
+    def update(self, blobs):
+        """Match blobs to existing tracks and assign the blobs' IDs."""
+        unmatched = list(self._tracks)
+        for blob in blobs:
+            row, col = blob.centroid
+            best = None
+            best_distance = self._max_distance_sq
+            for track in unmatched:
+                distance = (track[1] - row) ** 2 + (track[2] - col) ** 2
+                if distance <= best_distance:
+                    best, best_distance = track, distance
+            if best:
+                unmatched.remove(best)
+                best[1], best[2], best[3] = row, col, 0
+                blob.id = best[0]
+            else:
+                blob.id = self._next_id
+                self._next_id += 1
+                self._tracks.append([blob.id, row, col, 0])
+        for track in unmatched:
+            track[3] += 1
+            if track[3] > self._max_missing:
+                self._tracks.remove(track)
+        return blobs
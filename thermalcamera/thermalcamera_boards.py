@@ -0,0 +1,517 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_boards`
+================================================================================
+Thin board adapters for the display, input, audio, and LEDs of each supported
+board variant. The image pipeline itself is the shared ``ThermalCore``.
+
+Every adapter reports button presses through one ``InputEvents`` queue using
+the same logical key numbers (the PyGamer/PyBadge shift register order), so the
+primary process loop handles all boards alike. A board's hardware libraries are
+imported by its adapter so that only the libraries of the board in use need to
+be installed.
+
+================  ==========================================  =========
+Board             Adapter                                     Display
+================  ==========================================  =========
+PyGamer, PyBadge  ``PyGamerBoard``                            displayio
+CLUE              ``ClueBoard``                               displayio
+TFT FeatherWing   ``TFTWingBoard`` (M4, FeatherS2, nRF52840)  displayio
+miniTFT Wing      ``MiniTFTBoard``                            displayio
+PyPortal          ``PyPortalBoard`` (touch)                   displayio
+MatrixPortal      ``MatrixPortalBoard``                       matrix
+Dazzler Wing      ``DazzlerBoard``                            eve
+================  ==========================================  =========
+
+``code.py`` builds the displayio user interface for displayio boards and draws
+the whole frame with the board's renderer (``MatrixRenderer`` or
+``EveRenderer``) for the others.
+"""
+
+import time
+
+# Logical key numbers used by every adapter
+KEY_IMAGE = 0  # PyGamer/PyBadge button B
+KEY_HOLD = 1  # PyGamer/PyBadge button A
+KEY_SET = 2  # START button
+KEY_FOCUS = 3  # SELECT button
+KEY_RIGHT = 4
+KEY_DOWN = 5
+KEY_UP = 6
+KEY_LEFT = 7
+
+# Display size in pixels and display backend of each board; used to size the
+# display when the board is simulated
+PROFILES = {
+    "pygamer": (160, 128, "displayio"),
+    "clue": (240, 240, "displayio"),
+    "tft_wing": (320, 240, "displayio"),
+    "minitft_wing": (160, 80, "displayio"),
+    "pyportal": (320, 240, "displayio"),
+    "matrixportal": (64, 32, "matrix"),
+    "dazzler": (1280, 720, "eve"),
+}
+
+
+class InputEvent:
+    """A key press or release with the same attributes as ``keypad.Event``.
+
+    :param int key_number: The logical key number.
+    :param bool pressed: True for a press, False for a release.
+    """
+
+    def __init__(self, key_number, pressed=True):
+        self.key_number = key_number
+        self.pressed = pressed
+        self.released = not pressed
+
+
+class InputEvents:
+    """One event queue for hardware ``keypad`` keys and software events (such as
+    touch or seesaw buttons).
+
+    :param keys: Optional ``keypad`` object whose events are queued.
+    :param list key_map: Optional logical key number for each ``keypad`` key
+      number; None passes key numbers through unchanged.
+    :param function poll: Optional function called by ``get()`` to sample
+      software inputs and ``put()`` their events.
+    :param int max_events: Maximum number of queued software events.
+      Defaults to 8.
+    """
+
+    def __init__(self, keys=None, key_map=None, poll=None, max_events=8):
+        self._keys = keys
+        self._key_map = key_map
+        self._poll = poll
+        self._max_events = max_events
+        self._pending = []
+
+    def put(self, key_number, pressed=True):
+        """Queue a software event; the oldest event is dropped when full."""
+        if len(self._pending) >= self._max_events:
+            self._pending.pop(0)
+        self._pending.append(InputEvent(key_number, pressed))
+
+    def get(self):
+        """Remove and return the next event or None if there are no events."""
+        if self._poll:
+            self._poll()
+        if self._pending:
+            return self._pending.pop(0)
+        if self._keys:
+            event = self._keys.events.get()
+            if event and self._key_map:
+                return InputEvent(self._key_map[event.key_number], event.pressed)
+            return event
+        return None
+
+
+class TouchRegions:
+    """A touch hit-test table. The display is divided into square cells and the
+    logical key number of each cell is precomputed, so a hit test is one table
+    lookup regardless of the number of regions.
+
+    :param int width: Display width in pixels.
+    :param int height: Display height in pixels.
+    :param list regions: ``(x, y, width, height, key_number)`` of each touch
+      region; later regions overlay earlier regions.
+    :param int cell: Table cell size in pixels. Defaults to 8.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, width, height, regions, cell=8):
+        self._cell = cell
+        self._columns = (width + cell - 1) // cell
+        self._rows = (height + cell - 1) // cell
+        self._table = bytearray(self._columns * self._rows)  # Key number + 1
+        for x, y, region_width, region_height, key_number in regions:
+            last_row = min(self._rows, (y + region_height) // cell)
+            last_col = min(self._columns, (x + region_width) // cell)
+            for row in range(y // cell, last_row):
+                for col in range(x // cell, last_col):
+                    self._table[(row * self._columns) + col] = key_number + 1
+
+    def lookup(self, x, y):
+        """The logical key number at a display position or None."""
+        col = x // self._cell
+        row = y // self._cell
+        if not (0 <= col < self._columns and 0 <= row < self._rows):
+            return None
+        key_number = self._table[(row * self._columns) + col]
+        return key_number - 1 if key_number else None
+
+
+class BoardAdapter:
+    """A board without a display, input, audio, or LEDs; the base class of the
+    board adapters and the adapter used by the simulator.
+
+    :param str name: The board's ``PROFILES`` name. Defaults to "pygamer".
+    :param display: The board's display object or None to simulate it.
+    """
+
+    def __init__(self, name="pygamer", display=None):
+        self.name = name
+        self.width, self.height, self.renderer = PROFILES[name]
+        self.display = display
+        if display and self.renderer == "displayio":
+            self.width, self.height = display.width, display.height
+        self.events = InputEvents()
+        self.has_joystick = False
+        self._pixels = None
+        self._audio_pin = None
+
+    def tone(self, freq=440, duration=0.01):
+        """Play a tone; boards without a speaker pause for the duration."""
+        if self._audio_pin is None:
+            time.sleep(duration)
+            return
+        from simpleio import tone  # pylint: disable=import-outside-toplevel
+
+        tone(self._audio_pin, freq, duration)
+
+    def leds(self, color, index=None):
+        """Fill the NeoPixels with a color or set one NeoPixel by index."""
+        if self._pixels is None:
+            return
+        if index is None:
+            self._pixels.fill(color)
+        else:
+            self._pixels[index % len(self._pixels)] = color
+
+    @property
+    def led_count(self):
+        """The number of NeoPixels."""
+        return len(self._pixels) if self._pixels else 0
+
+    def joystick(self):
+        """The joystick position as up/down buttons: 1 up, -1 down, 0 centered."""
+        return 0
+
+    def set_input_layout(self, name):
+        """Select the touch region layout ("main" or "setup"); boards without a
+        touchscreen ignore it."""
+
+    def _neopixels(self, count, brightness=0.25):
+        # pylint: disable=import-outside-toplevel
+        import board
+        import neopixel
+
+        self._pixels = neopixel.NeoPixel(
+            board.NEOPIXEL, count, brightness=brightness, pixel_order=neopixel.GRB
+        )
+        self._pixels.fill(0x000000)
+
+
+class PyGamerBoard(BoardAdapter):
+    """PyGamer (joystick) or PyBadge (direction buttons)."""
+
+    def __init__(self):
+        # pylint: disable=import-outside-toplevel
+        import board
+        import keypad
+        from digitalio import DigitalInOut
+
+        super().__init__("pygamer", board.DISPLAY)
+        self.events = InputEvents(
+            keypad.ShiftRegisterKeys(
+                clock=board.BUTTON_CLOCK,
+                data=board.BUTTON_OUT,
+                latch=board.BUTTON_LATCH,
+                key_count=8,
+                value_when_pressed=True,
+            )
+        )
+        if hasattr(board, "JOYSTICK_X"):
+            from analogio import AnalogIn
+
+            self.has_joystick = True
+            self._joystick_y = AnalogIn(board.JOYSTICK_Y)
+        DigitalInOut(board.SPEAKER_ENABLE).switch_to_output(value=True)
+        self._audio_pin = board.A0
+        self._neopixels(5)
+
+    def joystick(self):
+        if self.has_joystick:
+            if self._joystick_y.value < 20000:
+                return 1
+            if self._joystick_y.value > 44000:
+                return -1
+        return 0
+
+
+class ButtonBoard(BoardAdapter):
+    """A board with a displayio display and individual button pins.
+
+    :param str name: The board's ``PROFILES`` name.
+    :param display: The board's display object.
+    :param dict buttons: Logical key number for each button pin.
+    :param bool value_when_pressed: The pin value of a pressed button.
+    :param audio_pin: The speaker pin or None for no speaker.
+    :param int neopixels: Number of NeoPixels. Defaults to 0.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self, name, display, buttons, value_when_pressed, audio_pin, neopixels=0
+    ):
+        import keypad  # pylint: disable=import-outside-toplevel
+
+        super().__init__(name, display)
+        pins = tuple(buttons)
+        self.events = InputEvents(
+            keypad.Keys(pins, value_when_pressed=value_when_pressed, pull=True),
+            key_map=[buttons[pin] for pin in pins],
+        )
+        self._audio_pin = audio_pin
+        if neopixels:
+            self._neopixels(neopixels)
+
+
+class ClueBoard(ButtonBoard):
+    """CLUE; button A holds the display and button B toggles the image mode."""
+
+    def __init__(self):
+        import board  # pylint: disable=import-outside-toplevel
+
+        super().__init__(
+            "clue",
+            board.DISPLAY,
+            {board.BUTTON_A: KEY_HOLD, board.BUTTON_B: KEY_IMAGE},
+            False,
+            board.SPEAKER,
+            neopixels=1,
+        )
+
+
+class TFTWingBoard(ButtonBoard):
+    """2.4-inch TFT FeatherWing (ILI9341) with focus, hold, and image buttons on
+    a Feather M4 Express, FeatherS2, or Feather nRF52840 Express."""
+
+    def __init__(self):
+        # pylint: disable=import-outside-toplevel
+        import board
+        import displayio
+        import adafruit_ili9341
+
+        if "feathers2" in board.board_id:
+            command, select, reset = board.D6, board.D5, board.D21
+            focus, hold, image = board.D14, board.D15, board.D16
+            audio_pin = None
+        elif "nrf52840" in board.board_id:
+            command, select, reset = board.D10, board.D9, board.D6
+            focus, hold, image = board.D2, board.D5, board.D11
+            audio_pin = board.A0
+        else:
+            command, select, reset = board.D10, board.D9, board.D6
+            focus, hold, image = board.D4, board.D5, board.D11
+            audio_pin = board.A0
+
+        displayio.release_displays()
+        display_bus = displayio.FourWire(
+            board.SPI(), command=command, chip_select=select, reset=reset
+        )
+        display = adafruit_ili9341.ILI9341(display_bus, width=320, height=240)
+        super().__init__(
+            "tft_wing",
+            display,
+            {focus: KEY_FOCUS, hold: KEY_HOLD, image: KEY_IMAGE},
+            True,
+            audio_pin,
+        )
+
+
+class MiniTFTBoard(BoardAdapter):
+    """miniTFT FeatherWing; its seesaw buttons are sampled at a fixed rate."""
+
+    # Logical key numbers of the seesaw buttons
+    _BUTTONS = (
+        ("select", KEY_HOLD),
+        ("a", KEY_FOCUS),
+        ("b", KEY_IMAGE),
+        ("left", KEY_SET),
+        ("up", KEY_UP),
+        ("down", KEY_DOWN),
+    )
+
+    def __init__(self, interval=0.05):
+        # pylint: disable=import-outside-toplevel
+        import board
+        import displayio
+        from adafruit_featherwing import minitft_featherwing
+
+        displayio.release_displays()
+        self._minitft = minitft_featherwing.MiniTFTFeatherWing()
+        super().__init__("minitft_wing", self._minitft.display)
+        self.events = InputEvents(poll=self._poll)
+        self._interval = interval
+        self._next_poll = 0
+        self._previous = set()
+        self._audio_pin = board.A0
+        self._neopixels(1, brightness=0.1)
+
+    def _poll(self):
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+        self._next_poll = now + self._interval
+        buttons = self._minitft.buttons
+        pressed = {key for name, key in self._BUTTONS if getattr(buttons, name)}
+        for key in pressed - self._previous:
+            self.events.put(key, True)
+        for key in self._previous - pressed:
+            self.events.put(key, False)
+        self._previous = pressed
+
+
+class PyPortalBoard(BoardAdapter):
+    """PyPortal; touch regions act as buttons. The resistive touchscreen is
+    sampled at a fixed rate and debounced; a touch must be seen (or missed) on
+    ``debounce`` consecutive samples to press (or release) a key.
+
+    :param float interval: Touchscreen sample interval in seconds.
+      Defaults to 0.05.
+    :param int debounce: Number of consecutive samples. Defaults to 2.
+    """
+
+    def __init__(self, interval=0.05, debounce=2):
+        # pylint: disable=import-outside-toplevel
+        import board
+        import adafruit_touchscreen
+        from digitalio import DigitalInOut
+
+        super().__init__("pyportal", board.DISPLAY)
+        DigitalInOut(board.SPEAKER_ENABLE).switch_to_output(value=True)
+        self._audio_pin = board.SPEAKER
+        self._neopixels(1)
+        self._touch = adafruit_touchscreen.Touchscreen(
+            board.TOUCH_XL,
+            board.TOUCH_XR,
+            board.TOUCH_YD,
+            board.TOUCH_YU,
+            calibration=((5200, 59000), (5800, 57000)),
+            size=(self.width, self.height),
+        )
+        self.events = InputEvents(poll=self._poll)
+        self._interval = interval
+        self._debounce = debounce
+        self._next_poll = 0
+        self._count = 0  # Consecutive samples that differ from the key state
+        self._key = None  # The pressed key number
+
+        # The sidebar top is the setup key (its upper half exits and its lower
+        # half calibrates in setup mode), two sidebar buttons toggle the image
+        # mode and the display range (up and down in setup mode), and the
+        # image is the hold key (enter in setup mode)
+        grid = self.height
+        sidebar = self.width - grid
+        top = (self.height * 7) // 12
+        button = self.height // 6
+        layouts = {
+            "main": ((KEY_SET,), KEY_IMAGE, KEY_FOCUS),
+            "setup": ((KEY_SET, KEY_FOCUS), KEY_UP, KEY_DOWN),
+        }
+        self._layouts = {}
+        for name, (top_keys, upper, lower) in layouts.items():
+            section = top // len(top_keys)
+            self._layouts[name] = TouchRegions(
+                self.width,
+                self.height,
+                [
+                    (0, index * section, sidebar, section, key)
+                    for index, key in enumerate(top_keys)
+                ]
+                + [
+                    (10, top + 5, sidebar - 20, button, upper),
+                    (10, top + button + 10, sidebar - 20, button, lower),
+                    (sidebar, 0, grid, grid, KEY_HOLD),
+                ],
+            )
+        self._regions = self._layouts["main"]
+
+    def set_input_layout(self, name):
+        self._regions = self._layouts[name]
+
+    def _poll(self):
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+        self._next_poll = now + self._interval
+        point = self._touch.touch_point
+        if (point is None) == (self._key is None):
+            self._count = 0  # No change
+            return
+        self._count += 1
+        if self._count < self._debounce:
+            return
+        self._count = 0
+        if point is None:
+            self.events.put(self._key, False)
+            self._key = None
+            return
+        self._key = self._regions.lookup(point[0], point[1])
+        if self._key is not None:
+            self.events.put(self._key, True)
+
+
+class MatrixPortalBoard(ButtonBoard):
+    """MatrixPortal M4 with a 64x32 RGB LED matrix."""
+
+    def __init__(self):
+        # pylint: disable=import-outside-toplevel
+        import board
+        from adafruit_matrixportal.matrix import Matrix
+
+        self.matrix = Matrix()
+        super().__init__(
+            "matrixportal",
+            self.matrix.display,
+            {
+                board.BUTTON_UP: KEY_HOLD,
+                board.BUTTON_DOWN: KEY_FOCUS,
+                board.A0: KEY_IMAGE,
+            },
+            False,
+            board.A1,
+        )
+
+
+class DazzlerBoard(BoardAdapter):
+    """Dazzler Wing (BridgeTek EVE graphics coprocessor)."""
+
+    def __init__(self):
+        # pylint: disable=import-outside-toplevel
+        import board
+        import bteve as eve
+
+        super().__init__("dazzler", eve.Gameduino())
+        self.display.init()
+        self._audio_pin = board.A0
+        self._neopixels(1, brightness=0.1)
+
+
+ADAPTERS = {
+    "pygamer": PyGamerBoard,
+    "clue": ClueBoard,
+    "tft_wing": TFTWingBoard,
+    "minitft_wing": MiniTFTBoard,
+    "pyportal": PyPortalBoard,
+    "matrixportal": MatrixPortalBoard,
+    "dazzler": DazzlerBoard,
+}
+
+
+def detect_board(name=None):
+    """Instantiate the adapter for a named board or, if the name is None, for
+    the detected board. FeatherWing displays cannot be detected and must be
+    named."""
+    if name is None:
+        import board  # pylint: disable=import-outside-toplevel
+
+        board_id = board.board_id
+        name = "pygamer"
+        for detected in ("clue", "pyportal", "matrixportal"):
+            if detected in board_id:
+                name = detected
+    return ADAPTERS[name]()
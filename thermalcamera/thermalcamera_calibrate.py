@@ -0,0 +1,162 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_calibrate`
+================================================================================
+Per-pixel sensor calibration and bad-pixel correction helpers.
+
+A calibration consists of per-pixel gain and offset tables, applied to each
+frame right after acquisition as one vectorized multiply-add, and a bad-pixel
+map. Each bad (stuck or noisy) pixel is replaced by the average of its good
+neighbors; the neighbor lists are precomputed when the map changes.
+
+Tables are produced by a flat-field capture that averages a number of frames of
+a uniform scene. One capture corrects the pixel offsets; a second capture of a
+uniform scene at a different temperature also corrects the pixel gains. The
+tables are packed into a compact binary layout for the persistent settings
+store.
+"""
+
+import struct
+from ulab import numpy as np
+
+_MAGIC = b"TCAL"
+_VERSION = 1
+
+
+class Calibration:
+    """Per-pixel gain, offset, and bad-pixel correction tables.
+
+    :param int axis: Sensor data axis size. Defaults to 8.
+    """
+
+    def __init__(self, axis=8):
+        self._axis = axis
+        self._size = axis**2
+        self._format = f"<4sB{self._size}f{self._size}f{self._size // 8}s"
+        self.gain = np.ones(self._size)
+        self.offset = np.zeros(self._size)
+        self.bad = []  # Bad pixel indices
+        self.identity = True  # True when the tables make no correction
+        self._replace = []  # (bad pixel index, good neighbor indices)
+
+    @property
+    def packed_size(self):
+        """Size in bytes of the packed calibration tables."""
+        return struct.calcsize(self._format)
+
+    def set_tables(self, gain, offset, bad=()):
+        """Set the gain and offset tables and the bad-pixel index list and
+        precompute the bad-pixel neighbor lists."""
+        self.gain = np.array(gain)
+        self.offset = np.array(offset)
+        self.bad = sorted(bad)
+        self._replace = []
+        for index in self.bad:
+            row, col = index // self._axis, index % self._axis
+            neighbors = []
+            for n_row in range(max(0, row - 1), min(self._axis, row + 2)):
+                for n_col in range(max(0, col - 1), min(self._axis, col + 2)):
+                    neighbor = (n_row * self._axis) + n_col
+                    if neighbor not in self.bad:
+                        neighbors.append(neighbor)
+            if neighbors:
+                self._replace.append((index, neighbors))
+        self.identity = (
+            not self.bad
+            and np.max(abs(self.gain - 1)) == 0
+            and np.max(abs(self.offset)) == 0
+        )
+
+    def apply(self, data):
+        """Correct a frame of sensor data; returns a new array of the same
+        shape or the original array if the tables make no correction."""
+        if self.identity:
+            return data
+        shape = data.shape
+        flat = (data.reshape((self._size,)) * self.gain) + self.offset
+        for index, neighbors in self._replace:
+            flat[index] = sum(flat[i] for i in neighbors) / len(neighbors)
+        return flat.reshape(shape)
+
+    def flat_field(self, average, previous=None, bad_threshold=2.0, min_spread=5.0):
+        """Calculate the tables from a flat-field capture average. If a
+        previous capture average at least ``min_spread`` degrees away is
+        provided, both gains and offsets are corrected; otherwise only the
+        offsets. Pixels deviating from the median by more than
+        ``bad_threshold`` degrees are marked as bad."""
+        median = np.sort(average)[self._size // 2]
+        bad = [i for i in range(self._size) if abs(average[i] - median) > bad_threshold]
+        good = [i for i in range(self._size) if i not in bad]
+        target = sum(average[i] for i in good) / len(good)
+
+        gain = np.ones(self._size)
+        if previous is not None:
+            previous_target = sum(previous[i] for i in good) / len(good)
+            if abs(target - previous_target) >= min_spread:
+                spread = average - previous
+                for i in good:
+                    if spread[i] != 0:
+                        gain[i] = (target - previous_target) / spread[i]
+        self.set_tables(gain, target - (gain * average), bad)
+
+    def pack(self):
+        """Pack the tables into bytes."""
+        bad_map = bytearray(self._size // 8)
+        for index in self.bad:
+            bad_map[index // 8] |= 1 << (index % 8)
+        return struct.pack(
+            self._format,
+            _MAGIC,
+            _VERSION,
+            *self.gain.tolist(),
+            *self.offset.tolist(),
+            bytes(bad_map),
+        )
+
+    def unpack(self, buffer):
+        """Load the tables from packed bytes; returns False and keeps the
+        current tables if the buffer does not contain valid tables."""
+        if len(buffer) < self.packed_size:
+            return False
+        values = struct.unpack(self._format, bytes(buffer[: self.packed_size]))
+        if values[0] != _MAGIC or values[1] != _VERSION:
+            return False
+        gain = values[2 : 2 + self._size]
+        offset = values[2 + self._size : 2 + (2 * self._size)]
+        bad_map = values[-1]
+        bad = [i for i in range(self._size) if bad_map[i // 8] & (1 << (i % 8))]
+        self.set_tables(gain, offset, bad)
+        return True
+
+
+class FlatFieldCapture:
+    """Average a number of frames of a uniform scene.
+
+    :param int frames: Number of frames to average. Defaults to 16.
+    :param int axis: Sensor data axis size. Defaults to 8.
+    """
+
+    def __init__(self, frames=16, axis=8):
+        self.frames = frames
+        self._size = axis**2
+        self._sum = np.zeros(self._size)
+        self.count = 0
+
+    @property
+    def done(self):
+        """True when all frames have been captured."""
+        return self.count >= self.frames
+
+    @property
+    def average(self):
+        """The average of the captured frames as a flat array."""
+        return self._sum / max(1, self.count)
+
+    def add(self, data):
+        """Add a frame of uncorrected sensor data; returns True when done."""
+        if not self.done:
+            self._sum += data.reshape((self._size,))
+            self.count += 1
+        return self.done
@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_change`
+================================================================================
+Frame-change detector that lets static scenes skip the display stages.
+
+Each new frame is compared with the last processed frame by the vectorized
+maximum absolute pixel difference. The sensor noise level is tracked as the
+smoothed maximum difference between consecutive frames, and the change
+threshold is a multiple of the noise level, limited to a configured range. A
+frame is processed when it differs from the last processed frame by more than
+the threshold, when processing was forced (for example by a display mode or
+range change), or when the heartbeat interval has passed since the last
+processed frame.
+"""
+
+import time
+from ulab import numpy as np
+
+
+class ChangeDetector:
+    """Skip frames that do not differ from the last processed frame.
+
+    :param float threshold: Minimum change threshold in degrees. Defaults to 0.5.
+    :param float max_threshold: Maximum change threshold in degrees.
+      Defaults to 2.0.
+    :param float noise_factor: Change threshold as a multiple of the noise
+      level. Defaults to 3.0.
+    :param float heartbeat: Maximum seconds between processed frames.
+      Defaults to 2.0.
+    :param float alpha: Noise level smoothing factor (0 to 1). Defaults to 0.05.
+    """
+
+    # pylint: disable=too-many-arguments, too-many-instance-attributes
+    def __init__(
+        self,
+        threshold=0.5,
+        max_threshold=2.0,
+        noise_factor=3.0,
+        heartbeat=2.0,
+        alpha=0.05,
+    ):
+        self._min_threshold = threshold
+        self._max_threshold = max_threshold
+        self._noise_factor = noise_factor
+        self._heartbeat = heartbeat
+        self._alpha = alpha
+        self.threshold = threshold
+        self.noise = 0  # Smoothed consecutive frame difference in degrees
+        self._processed = None  # Last processed frame
+        self._previous = None  # Last frame
+        self._processed_at = 0
+        self._forced = True
+        self.frames = 0
+        self.skipped = 0
+        self.process_time = 0  # Smoothed processing time of a frame, seconds
+        self.saved_time = 0  # Estimated processing time saved, seconds
+
+    @property
+    def skip_ratio(self):
+        """The fraction of frames skipped."""
+        return self.skipped / self.frames if self.frames else 0
+
+    def force(self):
+        """Process the next frame regardless of change."""
+        self._forced = True
+
+    def update(self, data, now=None):
+        """Compare a frame with the last processed frame. Returns True if the
+        frame should be processed."""
+        if now is None:
+            now = time.monotonic()
+        self.frames += 1
+        if self._previous is not None:
+            difference = np.max(abs(data - self._previous))
+            self.noise += self._alpha * (difference - self.noise)
+            self.threshold = max(
+                self._min_threshold,
+                min(self._max_threshold, self._noise_factor * self.noise),
+            )
+        self._previous = data
+        if (
+            self._forced
+            or self._processed is None
+            or now - self._processed_at >= self._heartbeat
+            or np.max(abs(data - self._processed)) > self.threshold
+        ):
+            self._forced = False
+            self._processed = data
+            self._processed_at = now
+            return True
+        self.skipped += 1
+        self.saved_time += self.process_time
+        return False
+
+    def record(self, duration):
+        """Record the processing time of a processed frame in seconds."""
+        self.process_time += 0.2 * (duration - self.process_time)
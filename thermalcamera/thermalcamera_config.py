@@ -7,10 +7,75 @@
 Thermal Camera configuration parameters.
 """
 
+# ### Factory default settings; changes made on the device are kept in NVM ###
+SETTINGS_RESET = False  # True to discard the stored settings at startup
+SETTINGS_NVM_START = 0  # Settings record location in microcontroller.nvm
+SETTINGS_WRITE_DELAY = 5.0  # Seconds without changes before settings are stored
+
 # ### Alarm and range default values in Fahrenheit ###
 ALARM_F = 120
 MIN_RANGE_F = 60
 MAX_RANGE_F = 120
 
+# ### Automatic display range (FOCUS button cycles ORIG, FOCUS, and AUTO)
+AUTO_RANGE_ALPHA = 0.2  # Range smoothing factor; 0 to 1, higher follows faster
+AUTO_RANGE_RATE_F = 2.0  # Maximum range change in degrees F per second
+AUTO_RANGE_MIN_SPAN_F = 4.0  # Minimum range span in degrees F
+
+# ### Rate-of-rise alarm
+RISE_ALARM_F_PER_MIN = 5  # Alarm when a pixel warms faster than this (degrees F/min)
+RISE_WINDOW = 30  # Number of samples in the rate-of-rise window
+RISE_INTERVAL = 2.0  # Seconds between rate-of-rise samples
+
+# ### Hotspot detection
+BLOB_DETECT = False  # True to detect, track, and mark hotspots
+BLOB_THRESHOLD_F = 100  # Hotspot temperature threshold in degrees F
+BLOB_MAX = 3  # Maximum number of marked hotspots
+BLOB_MIN_AREA = 2  # Minimum hotspot size in interpolated grid cells
+
+# ### Alarm zones; see thermalcamera_zones.py for the zone definition format
+# For example, the entry, middle, and end of a duct viewed across the sensor:
+#   ZONES = [
+#       {"name": "ENTRY", "rect": (0, 0, 7, 2), "alarm_f": 120},
+#       {"name": "MIDDLE", "rect": (0, 3, 7, 4), "alarm_f": 120, "tone": 988},
+#       {"name": "END", "rect": (0, 5, 7, 7), "alarm_f": 110, "hysteresis_f": 5},
+#   ]
+ZONES = []
+
+# ### Sensor calibration; flat-field capture is started with FOCUS in setup mode
+CALIBRATION_FRAMES = 16  # Number of uniform scene frames averaged per capture
+BAD_PIXEL_F = 4  # Pixels deviating from a uniform scene by more are replaced
+
+# ### Ambient and emissivity compensation; zones may set their own emissivity
+EMISSIVITY = 1.0  # Default surface emissivity; 1.0 for no compensation
+AMBIENT_INTERVAL = 10  # Seconds between sensor thermistor readings
+
+# ### Static scene frame skipping
+CHANGE_DETECT = False  # True to skip display updates while the scene is unchanged
+CHANGE_THRESHOLD_F = 1.0  # Minimum pixel change in degrees F that is processed
+CHANGE_HEARTBEAT = 2.0  # Maximum seconds between display updates
+
+# ### Battery power saving
+POWER_SAVE = False  # True to slow the sensor, dim, and sleep while nothing changes
+IDLE_TIME = 60  # Seconds without activity before 1 fps and a dimmed display
+SLEEP_TIME = 600  # Seconds without activity before sensor sleep and display off
+DIM_BRIGHTNESS = 0.1  # Idle display brightness
+SENSOR_INT_PIN = None  # Sensor INT pin name (e.g. "D5") to wake on alarm; None to poll
+
 # ### Display characteristics
+DISPLAY_UNITS = "F"  # Temperature display units; "F" or "C"
+BOARD = None  # Detect the board; "tft_wing", "minitft_wing", or "dazzler" for wings
 SELFIE = False  # Rear camera view; True for front view
+SMOOTH_RENDER = False  # Blocky 15x15 cell image; True for full-resolution smooth image
+SMOOTH_BAND = 16  # Smooth image rows rendered per bitmap write; limits memory use
+EQUALIZE = False  # Linear color mapping; True for histogram-equalized colors
+EQUALIZE_ALPHA = 0.3  # Equalization smoothing factor; 1.0 for the current frame only
+FONT_FILE = "/fonts/OpenSans-9.pcf"  # Binary font; "/fonts/OpenSans-9.bdf" for text
+
+# ### Display refresh
+TARGET_FRAME_TIME = 0.1  # Target frame time in seconds; None for unpaced refresh
+QUALITY_GOVERNOR = False  # True to reduce image quality when frames are late
+QUALITY_INTERVAL = 3  # Frames between label and stats updates at reduced quality
+
+# ### Startup
+BOOT_TIME_LIMIT = 4.0  # Power-on to first live frame time limit in seconds
@@ -4,15 +4,74 @@
 """
 `thermalcamera_converters`
 ================================================================================
-Celsius-to-Fahrenheit and Fahrenheit-to-Celsius converter helpers.
+Celsius-to-Fahrenheit and Fahrenheit-to-Celsius converter helpers and the
+selectable display units.
+
+``c_to_f`` and ``f_to_c`` do not round and accept a single value or a whole
+``ulab``/``numpy`` array; round a converted setting that must be a whole value.
+``delta_f_to_c`` converts temperature differences and rates, which have no
+offset. Fahrenheit configuration values are converted once when loaded.
+Temperatures and thresholds are kept in Celsius; ``DisplayUnits`` produces the
+display strings of Celsius values from a table precomputed when the units are
+selected, so the selected units add no conversion work per frame.
 """
 
 
-def celsius_to_fahrenheit(deg_c=None):
-    """Convert C to F; round to 1 degree C"""
-    return round(((9 / 5) * deg_c) + 32)
+def c_to_f(deg_c):
+    """Convert a C value or array of values to F without rounding"""
+    return (deg_c * 1.8) + 32
+
+
+def f_to_c(deg_f):
+    """Convert an F value or array of values to C without rounding"""
+    return (deg_f - 32) / 1.8
+
+
+def delta_f_to_c(delta_f):
+    """Convert an F temperature difference or rate to C without rounding"""
+    return delta_f / 1.8
+
+
+class DisplayUnits:
+    """Display strings of Celsius temperatures in the selected units.
+
+    :param str name: "F" for Fahrenheit or "C" for Celsius. Defaults to "F".
+    :param tuple limits: The Celsius range of the precomputed display string
+      table; values outside of it are shown as the nearest limit.
+      Defaults to (-20, 100).
+    """
+
+    def __init__(self, name="F", limits=(-20, 100)):
+        self.name = name
+        self.fahrenheit = name == "F"
+        # Steps of the sensor's 0.25 degree C resolution for F; whole degrees
+        #   for C. Entries with the same text share one string.
+        self._steps = 4 if self.fahrenheit else 1
+        self._low = limits[0]
+        self._last = (limits[1] - limits[0]) * self._steps
+        strings = {}
+        self._table = []
+        for i in range(self._last + 1):
+            value = self.from_celsius(self._low + (i / self._steps))
+            self._table.append(strings.setdefault(value, str(value)))
+
+    def from_celsius(self, deg_c):
+        """Convert a C value to a whole display unit value"""
+        return round(c_to_f(deg_c)) if self.fahrenheit else round(deg_c)
+
+    def from_fahrenheit(self, deg_f):
+        """Convert an F setting to a whole display unit value"""
+        return deg_f if self.fahrenheit else round(f_to_c(deg_f))
+
+    def to_fahrenheit(self, value):
+        """Convert a whole display unit value to an F setting"""
+        return value if self.fahrenheit else round(c_to_f(value))
 
+    def delta(self, delta_c):
+        """Convert a C temperature difference or rate to display units"""
+        return delta_c * 1.8 if self.fahrenheit else delta_c
 
-def fahrenheit_to_celsius(deg_f=None):
-    """Convert F to C; round to 1 degree F"""
-    return round((deg_f - 32) * (5 / 9))
+    def text(self, deg_c):
+        """The display string of a C value"""
+        index = int(((deg_c - self._low) * self._steps) + 0.5)
+        return self._table[max(0, min(self._last, index))]
@@ -0,0 +1,145 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_core`
+================================================================================
+Board-independent thermal image pipeline core.
+
+Acquires a sensor frame, applies the calibration and ambient compensation
+stages, limits the values to the sensor's range, calculates the frame
+statistics, normalizes to the display range with a precomputed scale factor,
+interpolates to the display grid, and maps the grid to palette indices. Every
+stage is a vectorized ``ulab`` operation; there are no per-pixel Python loops.
+
+Board-specific display, input, audio, and LED handling is provided by the
+adapters in ``thermalcamera_boards.py`` so that every board variant shares
+this one pipeline.
+"""
+
+import time
+from ulab import numpy as np
+from thermalcamera_stats import FrameStats
+
+
+class ThermalCore:
+    """The acquire, correct, stats, normalize, interpolate, and color-map
+    pipeline.
+
+    :param sensor: The ``adafruit_amg88xx.AMG88XX`` sensor object or any object
+      with a ``pixels`` property of ``axis`` x ``axis`` temperatures in Celsius.
+    :param int axis: Sensor data axis size. Defaults to 8.
+    :param int palette_size: Number of palette colors. Defaults to 100.
+    :param calibration: Optional ``Calibration`` tables. Defaults to None.
+    :param ambient: Optional ``AmbientCompensation``. Defaults to None.
+    :param tuple limits: Sensor temperature range in Celsius. Defaults to (0, 80).
+    """
+
+    # pylint: disable=too-many-arguments, too-many-instance-attributes
+    def __init__(
+        self,
+        sensor,
+        axis=8,
+        palette_size=100,
+        calibration=None,
+        ambient=None,
+        limits=(0, 80),
+    ):
+        self.sensor = sensor
+        self.axis = axis
+        self.grid_axis = (2 * axis) - 1
+        self.palette_size = palette_size
+        self.calibration = calibration
+        self.ambient = ambient
+        self._limits = limits
+        self.stats = FrameStats(axis=axis)
+        self.pixels = sensor.pixels  # Most recent uncorrected sensor reading
+        self.raw = np.array(self.pixels)  # Uncorrected sensor data
+        self.data = self.raw  # Corrected sensor data in Celsius
+        self.normalized = self.raw  # Normalized sensor data
+        # Display grid; holds a sample spectrum until the first frame
+        self.grid = np.array(range(self.grid_axis**2)).reshape(
+            (self.grid_axis, self.grid_axis)
+        ) / (self.grid_axis**2)
+        self.min_c = 0
+        self.max_c = 1
+        self.scale = 1  # Normalization scale factor
+        self.times = {}  # Stage durations in seconds
+
+    def set_range(self, min_c, max_c):
+        """Set the display range in Celsius and precompute the normalization
+        scale factor; call only when the range changes."""
+        self.min_c = min_c
+        self.max_c = max_c
+        self.scale = 1 / ((max_c - min_c) or 1)
+
+    def normalize_value(self, value_c):
+        """Normalize a single temperature to the display range."""
+        return (value_c - self.min_c) * self.scale
+
+    def acquire(self, hold=False):
+        """Read (unless held) and correct a sensor frame. Returns the corrected
+        sensor data in Celsius."""
+        start = time.monotonic()
+        if not hold:
+            self.pixels = self.sensor.pixels
+        self.raw = np.array(self.pixels)
+        data = self.raw
+        if self.calibration:
+            data = self.calibration.apply(data)
+        if self.ambient:
+            self.ambient.update()
+            data = self.ambient.apply(data)
+        self.data = np.clip(data, self._limits[0], self._limits[1])
+        self.times["acquire"] = time.monotonic() - start
+        return self.data
+
+    def update_stats(self):
+        """Calculate the statistics of the corrected sensor data."""
+        start = time.monotonic()
+        self.stats.update(self.data)
+        self.times["stats"] = time.monotonic() - start
+        return self.stats
+
+    def interpolate(self, coarse=False, data=None):
+        """Normalize the corrected sensor data (or other Celsius ``data`` of the
+        same shape) to the display range and interpolate to the display grid;
+        ``coarse`` repeats the nearest sensor value instead. Returns the
+        normalized sensor data."""
+        start = time.monotonic()
+        if data is None:
+            data = self.data
+        self.normalized = (data - self.min_c) * self.scale
+        grid = self.grid
+        grid[::2, ::2] = self.normalized
+        grid[1::2, ::2] = self.normalized[:-1, :]
+        if coarse:
+            grid[::, 1::2] = grid[::, :-1:2]
+        else:
+            # 2x bilinear interpolation; by @v923z and @David.Glaude
+            grid[1::2, ::2] += self.normalized[1:, :]
+            grid[1::2, ::2] /= 2
+            grid[::, 1::2] = grid[::, :-1:2]
+            grid[::, 1::2] += grid[::, 2::2]
+            grid[::, 1::2] /= 2
+        self.times["interpolate"] = time.monotonic() - start
+        return self.normalized
+
+    def color_indices(self, grid=None):
+        """Map normalized grid data (default: the display grid) to palette
+        indices. Returns a ``uint8`` array of the same shape."""
+        start = time.monotonic()
+        if grid is None:
+            grid = self.grid
+        top = self.palette_size - 1
+        indices = np.array(np.clip((grid * top) + 0.5, 0, top), dtype=np.uint8)
+        self.times["color map"] = time.monotonic() - start
+        return indices
+
+    def step(self, hold=False):
+        """Run the full pipeline for one frame. Returns the palette indices of
+        the display grid."""
+        self.acquire(hold)
+        self.update_stats()
+        self.interpolate()
+        return self.color_indices()
@@ -0,0 +1,154 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_digits`
+================================================================================
+Numeric readout widget built from prerendered digit sprites.
+
+The digit, minus sign, and degree symbol glyphs of a font are rendered once into
+a sprite sheet bitmap. A readout is a ``TileGrid`` over the sheet with one tile
+per character, so changing its text only changes a few tile indices; no
+bitmap is rebuilt or allocated. ``DigitLabel`` has the ``text``, ``color``,
+``anchor_point``, and ``anchored_position`` properties of
+``adafruit_display_text.label.Label`` that the user interface uses, so it
+replaces a ``Label`` for numeric values.
+"""
+
+import displayio
+
+DIGIT_CHARACTERS = "0123456789-°"
+
+
+class DigitSheet:
+    """A sprite sheet of digit glyphs rendered from a font.
+
+    :param font: The loaded ``adafruit_bitmap_font`` font.
+    :param str characters: The characters to render.
+      Defaults to the digits, minus sign, and degree symbol.
+    """
+
+    def __init__(self, font, characters=DIGIT_CHARACTERS):
+        glyphs = [font.get_glyph(ord(char)) for char in characters]
+        _, height, _, y_offset = font.get_bounding_box()
+        self.tile_width = max(glyph.shift_x for glyph in glyphs if glyph)
+        self.tile_height = height
+        baseline = height + y_offset
+        # The last tile is blank
+        self.bitmap = displayio.Bitmap(
+            self.tile_width * (len(characters) + 1), self.tile_height, 2
+        )
+        self.blank = len(characters)
+        self.index = {}  # Tile index of each character
+        for tile, (char, glyph) in enumerate(zip(characters, glyphs)):
+            if glyph is None:
+                self.index[char] = self.blank  # Not in the font
+                continue
+            self.index[char] = tile
+            top = baseline - glyph.height - glyph.dy
+            for y in range(max(0, -top), min(glyph.height, height - top)):
+                for x in range(glyph.width):
+                    tile_x = glyph.dx + x
+                    if glyph.bitmap[x, y] and 0 <= tile_x < self.tile_width:
+                        self.bitmap[(tile * self.tile_width) + tile_x, top + y] = 1
+
+
+class DigitLabel(displayio.Group):
+    """A fixed-width numeric readout; a drop-in replacement for a ``Label``
+    that shows only the sprite sheet's characters. Other characters show as
+    blanks and text longer than ``max_chars`` is truncated.
+
+    :param DigitSheet sheet: The digit sprite sheet.
+    :param str text: The initial text. Defaults to "".
+    :param int color: The text color or None to hide. Defaults to white.
+    :param int max_chars: Number of character tiles. Defaults to 4.
+    """
+
+    def __init__(self, sheet, text="", color=0xFFFFFF, max_chars=4):
+        super().__init__()
+        self._sheet = sheet
+        self._max_chars = max_chars
+        self._palette = displayio.Palette(2)
+        self._palette.make_transparent(0)
+        self._tiles = displayio.TileGrid(
+            sheet.bitmap,
+            pixel_shader=self._palette,
+            width=max_chars,
+            height=1,
+            tile_width=sheet.tile_width,
+            tile_height=sheet.tile_height,
+            default_tile=sheet.blank,
+        )
+        self.append(self._tiles)
+        self._text = None
+        self._color = None
+        self._anchor_point = (0, 0)
+        self._anchored_position = (0, 0)
+        self.color = color
+        self.text = text
+
+    @property
+    def text(self):
+        """The displayed text."""
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        text = str(text)
+        if text == self._text:
+            return
+        self._text = text
+        count = min(len(text), self._max_chars)
+        # Align the text within the tiles as the anchor point aligns the widget
+        start = round((self._max_chars - count) * self._anchor_point[0])
+        index = self._sheet.index
+        for tile in range(self._max_chars):
+            position = tile - start
+            if 0 <= position < count:
+                self._tiles[tile] = index.get(text[position], self._sheet.blank)
+            else:
+                self._tiles[tile] = self._sheet.blank
+
+    @property
+    def color(self):
+        """The text color or None when hidden."""
+        return self._color
+
+    @color.setter
+    def color(self, color):
+        self._color = color
+        if color is None:
+            self._tiles.hidden = True
+        else:
+            self._palette[1] = color
+            self._tiles.hidden = False
+
+    @property
+    def anchor_point(self):
+        """The ``(x, y)`` anchor point as fractions of the widget size."""
+        return self._anchor_point
+
+    @anchor_point.setter
+    def anchor_point(self, anchor_point):
+        self._anchor_point = anchor_point
+        self._place()
+        text, self._text = self._text, None
+        self.text = text  # Realign
+
+    @property
+    def anchored_position(self):
+        """The ``(x, y)`` display position of the anchor point."""
+        return self._anchored_position
+
+    @anchored_position.setter
+    def anchored_position(self, anchored_position):
+        self._anchored_position = anchored_position
+        self._place()
+
+    def _place(self):
+        width = self._max_chars * self._sheet.tile_width
+        self.x = round(self._anchored_position[0] - (self._anchor_point[0] * width))
+        self.y = round(
+            self._anchored_position[1]
+            - (self._anchor_point[1] * self._sheet.tile_height)
+        )
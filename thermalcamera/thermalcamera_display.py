@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_display`
+================================================================================
+Frame-synchronous display refresh scheduler.
+
+Turns off the display's ``auto_refresh`` so that all display group changes made
+while building a frame are batched and pushed to the display with a single
+``refresh()`` call at the end of the frame. This prevents partially updated
+frames (tearing) and redundant SPI transfers.
+
+A display that is not a displayio display (such as the Dazzler's EVE
+coprocessor, which swaps its own frames) is paced without a refresh.
+"""
+
+import time
+
+
+class FrameScheduler:
+    """Refresh the display once per frame at a target frame time.
+
+    :param display: The display object, e.g. ``board.DISPLAY``, or None to pace
+      the frames only.
+    :param float frame_time: Target frame time in seconds; ``None`` refreshes
+      immediately without pacing. Defaults to 0.1 (the AMG8833's 10 frames/sec).
+    """
+
+    def __init__(self, display, frame_time=0.1):
+        self._display = display
+        if display:
+            display.auto_refresh = False
+        self.frame_time = frame_time
+        self.refresh_time = 0  # Duration of the most recent refresh, seconds
+        self.wait_time = 0  # Time spent waiting for the target frame time, seconds
+        self.frames = 0  # Number of refreshed frames
+        self._last_refresh = time.monotonic()
+
+    def refresh(self):
+        """Push all pending display changes to the display. When a target frame
+        time is set and the frame finished early, first waits for the remainder
+        of the frame time. A late frame is refreshed immediately; unlike the
+        ``target_frames_per_second`` option of ``display.refresh()``, a late frame
+        is never skipped."""
+        start = time.monotonic()
+        self.wait_time = 0
+        if self.frame_time:
+            self.wait_time = self.frame_time - (start - self._last_refresh)
+            if self.wait_time > 0:
+                time.sleep(self.wait_time)
+                start = time.monotonic()
+            else:
+                self.wait_time = 0
+        if self._display:
+            self._display.refresh()
+        self._last_refresh = time.monotonic()
+        self.refresh_time = self._last_refresh - start
+        self.frames += 1
@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_equalize`
+================================================================================
+Histogram-equalized color mapping helper.
+
+Builds the cumulative distribution (CDF) of each frame's normalized temperatures
+from a single sort and samples it at a small number of evenly spaced points to
+form a lookup table. The table is smoothed over several frames and applied to
+the image data with ``np.interp`` before the palette lookup, so the image uses
+the full palette even when most of the scene is within a few degrees. All
+per-frame operations are vectorized.
+"""
+
+from ulab import numpy as np
+
+
+class HistogramEqualizer:
+    """Frame-to-frame smoothed histogram equalization lookup table.
+
+    :param int points: Number of lookup table points between normalized values
+      0.0 and 1.0. Defaults to 17.
+    :param float alpha: Lookup table smoothing factor (0 to 1); 1.0 uses only
+      the current frame's histogram. Defaults to 0.3.
+    """
+
+    def __init__(self, points=17, alpha=0.3):
+        self.alpha = alpha
+        self._edges = np.linspace(0, 1, points)
+        self.lut = np.linspace(0, 1, points)  # Starts as the linear mapping
+
+    def reset(self):
+        """Restore the linear mapping."""
+        self.lut = np.linspace(0, 1, self._edges.size)
+
+    def update(self, data):
+        """Update the lookup table from the CDF of a frame of normalized data."""
+        ordered = np.sort(data.reshape((data.size,)))
+        ranks = np.linspace(0, 1, ordered.size)
+        cdf = np.interp(self._edges, ordered, ranks)
+        self.lut = self.lut + (self.alpha * (cdf - self.lut))
+
+    def apply(self, data):
+        """Map normalized data through the lookup table; returns a new array of
+        the same shape with equalized values from 0.0 to 1.0."""
+        shape = data.shape
+        flat = np.interp(data.reshape((data.size,)), self._edges, self.lut)
+        return flat.reshape(shape)
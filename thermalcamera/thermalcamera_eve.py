@@ -0,0 +1,169 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_eve`
+================================================================================
+Retained display list thermal image renderer for the Dazzler Wing's BT815
+(EVE3) graphics coprocessor; it uses only FT81x and later commands.
+
+The static display list (bitmap setup, scaling, image, and sidebar captions)
+is built once, copied to ``RAM_G`` with ``cmd_memcpy``, and replayed each frame
+with ``cmd_append``. A new image uploads only its palette indices.
+
+``RAM_G`` layout::
+
+    0x00000  palette (2 bytes per color)
+    0x01000  grid bitmap (1 byte per cell)
+    0x02000  static display list
+"""
+
+import struct
+
+# EVE constants (from ``bteve.registers``)
+_BITMAPS = 1
+_PALETTED565 = 14
+_NEAREST = 0
+_BILINEAR = 1
+_BORDER = 0
+_OPT_CENTER = 1536
+_RAM_DL = 0x300000
+_REG_CMD_DL = 0x302100  # Display list bytes written by the coprocessor
+_CMD_SCALE = 0xFFFFFF28
+
+_PALETTE_ADDR = 0x00000
+_BITMAP_ADDR = 0x01000
+_LIST_ADDR = 0x02000
+
+
+def _rgb565(color):
+    """Convert an RGB888 color value to RGB565."""
+    return ((color >> 8) & 0xF800) | ((color >> 5) & 0x07E0) | ((color >> 3) & 0x001F)
+
+
+def _f16(value):
+    """Convert a number to 16.16 fixed point."""
+    return round(value * 65536)
+
+
+def _rgb(color):
+    """Split an RGB888 color value into its red, green, and blue components."""
+    return (color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF
+
+
+class EveRenderer:
+    """Render palette index grids and sidebar values with a retained display
+    list.
+
+    :param gd: The initialized ``bteve.Gameduino`` coprocessor object.
+    :param int width: Display width in pixels.
+    :param int height: Display height in pixels.
+    :param list colors: The palette's RGB color values.
+    :param list fields: ``(label, color)`` of each sidebar value, top to bottom.
+    :param int grid_axis: Number of grid cells per axis. Defaults to 15.
+    :param bool selfie: True for the front (selfie) view. Defaults to False.
+    :param bool smooth: True to filter the scaled image bilinearly rather than
+      show square cells. Defaults to False.
+    :param int font: The EVE ROM font number. Defaults to 31.
+    """
+
+    # pylint: disable=too-many-arguments, too-many-instance-attributes
+    def __init__(
+        self,
+        gd,
+        width,
+        height,
+        colors,
+        fields,
+        grid_axis=15,
+        selfie=False,
+        smooth=False,
+        font=31,
+    ):
+        self._gd = gd
+        self._axis = grid_axis
+        self._selfie = selfie
+        self._font = font
+        self._cells = grid_axis**2
+        self._pad = bytes(-self._cells & 3)  # Command data is 32-bit aligned
+        self.grid_size = (height // grid_axis) * grid_axis
+        self.grid_x_offset = width - self.grid_size
+        # Sidebar value positions and colors: (x, y, red, green, blue)
+        spacing = height // len(fields)
+        self._values = [
+            (self.grid_x_offset // 2, (spacing * i) + (spacing // 3), *_rgb(color))
+            for i, (_, color) in enumerate(fields)
+        ]
+
+        self._list_size = 0  # Bytes of the static display list in RAM_G
+        self.set_palette(colors)
+        self._build_list(fields, spacing, smooth)
+
+    def set_palette(self, colors):
+        """Write the palette's color values to ``RAM_G``."""
+        table = struct.pack(f"<{len(colors)}H", *(_rgb565(c) for c in colors))
+        self._gd.cmd_memwrite(_PALETTE_ADDR, len(table))
+        self._gd.cc(table + bytes(-len(table) & 3))
+
+    def _build_list(self, fields, spacing, smooth):
+        """Build the static display list and copy it to ``RAM_G``."""
+        gd = self._gd
+        size = self.grid_size
+        gd.cmd_dlstart()
+        gd.ClearColorRGB(0, 0, 0)
+        gd.Clear()
+        gd.VertexFormat(0)
+        for (label, _), (x, y, red, green, blue) in zip(fields, self._values):
+            gd.ColorRGB(red, green, blue)
+            gd.cmd_text(x, y + (spacing // 3), self._font, _OPT_CENTER, label)
+        gd.ColorRGB(0xFF, 0xFF, 0xFF)
+        gd.BitmapHandle(0)
+        gd.BitmapSource(_BITMAP_ADDR)
+        gd.PaletteSource(_PALETTE_ADDR)
+        gd.BitmapLayout(_PALETTED565, self._axis, self._axis)
+        gd.BitmapLayoutH(0, 0)
+        gd.BitmapSize(_BILINEAR if smooth else _NEAREST, _BORDER, _BORDER, size, size)
+        gd.BitmapSizeH(size >> 9, size >> 9)
+        gd.cmd_loadidentity()
+        # CMD_SCALE takes 16.16 fixed point factors; encoded here explicitly
+        scale = _f16(size / self._axis)
+        gd.cc(struct.pack("<Iii", _CMD_SCALE, scale, scale))
+        gd.cmd_setmatrix()
+        gd.Begin(_BITMAPS)
+        gd.Vertex2f(self.grid_x_offset, 0)
+        gd.End()
+        gd.finish()
+        self._list_size = gd.rd32(_REG_CMD_DL)
+        gd.cmd_memcpy(_LIST_ADDR, _RAM_DL, self._list_size)
+        gd.finish()
+
+    def render(self, indices):
+        """Upload a grid of palette indices (a ``uint8`` array with the sensor's
+        orientation); it is shown from the next ``show()``."""
+        if self._selfie:
+            indices = indices[::-1, :]
+        else:
+            indices = indices[::-1, ::-1]
+        self._gd.cmd_memwrite(_BITMAP_ADDR, self._cells)
+        self._gd.cc(indices.copy().tobytes() + self._pad)  # A dense copy of the view
+
+    def show(self, values, status=None):
+        """Show the uploaded image with the sidebar value strings and an
+        optional ``(text, color)`` status message centered on the image."""
+        gd = self._gd
+        gd.cmd_dlstart()
+        gd.cmd_append(_LIST_ADDR, self._list_size)
+        for (x, y, red, green, blue), text in zip(self._values, values):
+            if text:
+                gd.ColorRGB(red, green, blue)
+                gd.cmd_text(x, y, self._font, _OPT_CENTER, text)
+        if status:
+            gd.ColorRGB(*_rgb(status[1]))
+            gd.cmd_text(
+                self.grid_x_offset + (self.grid_size // 2),
+                self.grid_size // 2,
+                self._font,
+                _OPT_CENTER,
+                status[0],
+            )
+        gd.swap()
@@ -0,0 +1,43 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_fonts`
+================================================================================
+Font loading and glyph preloading helpers.
+
+Fonts load glyphs lazily; the first appearance of a new character otherwise
+parses the font file in the middle of a frame. Preloading every glyph the user
+interface can display moves that work to startup. A prebuilt PCF font (see
+``tools/bdf_to_pcf.py``) is binary and indexed, so it loads without text
+parsing; the BDF font remains as the fallback.
+"""
+
+import time
+from adafruit_bitmap_font import bitmap_font
+
+
+def load_font(paths):
+    """Load the first available font file from a list of paths. Returns the
+    font, the path of the loaded file, and the load time in seconds."""
+    error = None
+    for path in paths:
+        start = time.monotonic()
+        try:
+            font = bitmap_font.load_font(path)
+        except (OSError, ValueError) as load_error:
+            error = load_error
+            continue
+        return font, path, time.monotonic() - start
+    raise error
+
+
+def preload_glyphs(font, texts):
+    """Load the glyphs for every character used in a list of strings. Returns
+    the preload time in seconds."""
+    start = time.monotonic()
+    characters = set()
+    for text in texts:
+        characters.update(text)
+    font.load_glyphs("".join(characters))
+    return time.monotonic() - start
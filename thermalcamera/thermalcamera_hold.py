@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_hold`
+================================================================================
+Peak-hold and min-hold image accumulation.
+
+The corrected sensor frames are accumulated per pixel into a persistent
+buffer with one vectorized ``np.maximum`` (peak hold) or ``np.minimum``
+(min hold) per frame, so a hotspot or cold spot that appears for a single
+frame stays in the image until the accumulation is reset. Accumulation is
+done on the 8x8 sensor data before interpolation, the smallest array in the
+pipeline. ``ulab``'s ``maximum`` and ``minimum`` have no ``out`` argument, so
+each frame's result is a new 64-element array that replaces the buffer.
+"""
+
+import time
+from ulab import numpy as np
+
+PEAK = "PEAK"
+MIN = "MIN"
+
+
+class HoldAccumulator:
+    """Accumulate the per-pixel peak or minimum of the sensor frames.
+
+    :param str mode: ``PEAK`` or ``MIN``. Defaults to ``PEAK``.
+    """
+
+    def __init__(self, mode=PEAK):
+        self.mode = mode
+        self._op = np.maximum
+        self.buffer = None  # Accumulated sensor data in Celsius
+        self.frames = 0  # Frames accumulated since the reset
+        self.started = time.monotonic()
+        self.reset(mode)
+
+    @property
+    def elapsed(self):
+        """Seconds since the accumulation was reset."""
+        return time.monotonic() - self.started
+
+    def reset(self, mode=None):
+        """Restart the accumulation, optionally in a new mode."""
+        if mode:
+            self.mode = mode
+            self._op = np.maximum if mode == PEAK else np.minimum
+        self.buffer = None
+        self.frames = 0
+        self.started = time.monotonic()
+
+    def update(self, data):
+        """Accumulate a frame of sensor data. Returns the accumulated data."""
+        if self.buffer is None:
+            self.buffer = data
+        else:
+            self.buffer = self._op(self.buffer, data)
+        self.frames += 1
+        return self.buffer
@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_matrix`
+================================================================================
+RGB LED matrix thermal image renderer for the MatrixPortal.
+
+The whole panel is one ``displayio.Bitmap``. The interpolated grid is scaled to
+the panel's grid area with two ``ulab`` matrix products using precomputed
+nearest-cell selection matrices and written with one
+``bitmaptools.arrayblit`` call; there is no per-cell ``Rect`` or per-pixel
+Python loop. The image orientation (rear or selfie view) is folded into the
+selection matrices.
+
+LED brightness is linear with the PWM duty cycle while perceived brightness is
+not, so the palette colors are gamma corrected once when the palette is built.
+Sidebar values use a tiny 3x5 pixel digit font; each glyph is prerendered as a
+small bitmap per color and a value is redrawn with ``bitmaptools.blit`` only
+when its text changes. The panel has no room for status messages.
+"""
+
+import time
+import displayio
+import bitmaptools
+from ulab import numpy as np
+
+# 3x5 pixel glyphs; one 3-bit row pattern per line, top to bottom
+GLYPHS = {
+    "0": (7, 5, 5, 5, 7),
+    "1": (2, 6, 2, 2, 7),
+    "2": (7, 1, 7, 4, 7),
+    "3": (7, 1, 3, 1, 7),
+    "4": (5, 5, 7, 1, 1),
+    "5": (7, 4, 7, 1, 7),
+    "6": (7, 4, 7, 5, 7),
+    "7": (7, 1, 2, 2, 2),
+    "8": (7, 5, 7, 5, 7),
+    "9": (7, 5, 7, 1, 7),
+    "-": (0, 0, 7, 0, 0),
+    " ": (0, 0, 0, 0, 0),
+}
+GLYPH_WIDTH = 3
+GLYPH_HEIGHT = 5
+
+
+def gamma_correct(colors, gamma=2.2):
+    """Gamma correct a list of RGB color values for LED perception."""
+    table = [round(((i / 255) ** gamma) * 255) for i in range(256)]
+    corrected = []
+    for color in colors:
+        red = table[(color >> 16) & 0xFF]
+        green = table[(color >> 8) & 0xFF]
+        corrected.append((red << 16) | (green << 8) | table[color & 0xFF])
+    return corrected
+
+
+def selection_matrix(size_out, size_in):
+    """Build a ``size_out`` x ``size_in`` matrix that selects the nearest input
+    sample for each output sample."""
+    weights = np.zeros((size_out, size_in))
+    for out in range(size_out):
+        weights[out, (out * size_in) // size_out] = 1
+    return weights
+
+
+class MatrixRenderer:
+    """Render palette index grids and sidebar values into a full-panel bitmap.
+
+    :param int width: Panel width in pixels.
+    :param int height: Panel height in pixels; also the grid area size.
+    :param list colors: The spectrum's RGB color values.
+    :param list value_colors: The RGB color of each sidebar value, top to bottom.
+    :param int grid_axis: Number of grid cells per axis. Defaults to 15.
+    :param bool selfie: True for the front (selfie) view. Defaults to False.
+    :param float gamma: LED gamma correction exponent. Defaults to 2.2.
+    :param int digits: Number of characters in each value. Defaults to 3.
+    """
+
+    # pylint: disable=too-many-arguments, too-many-instance-attributes
+    def __init__(
+        self,
+        width,
+        height,
+        colors,
+        value_colors,
+        grid_axis=15,
+        selfie=False,
+        gamma=2.2,
+        digits=3,
+    ):
+        self._size = height
+        self._x = width - height  # Right-align the grid area
+        self._digits = digits
+        self._spectrum = len(colors)
+        # Palette: spectrum, then black, then the sidebar value colors
+        self.palette = displayio.Palette(self._spectrum + 1 + len(value_colors))
+        for i, color in enumerate(gamma_correct(colors + [0] + value_colors, gamma)):
+            self.palette[i] = color
+        self.bitmap = displayio.Bitmap(width, height, len(self.palette))
+        self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
+
+        # Grid rows are displayed bottom-to-top; columns are mirrored for the
+        # rear view. Reversing the selection rows performs the flip.
+        weights = selection_matrix(height, grid_axis)
+        self._row_weights = weights[::-1, :]
+        if selfie:
+            self._col_weights = weights.transpose()
+        else:
+            self._col_weights = weights[::-1, :].transpose()
+
+        # Prerendered glyph bitmaps for each value color
+        self._glyphs = []
+        for index in range(len(value_colors)):
+            glyphs = {}
+            for char, rows in GLYPHS.items():
+                glyph = displayio.Bitmap(GLYPH_WIDTH, GLYPH_HEIGHT, len(self.palette))
+                glyph.fill(self._spectrum)  # Black background
+                for y, pattern in enumerate(rows):
+                    for x in range(GLYPH_WIDTH):
+                        if pattern & (1 << (GLYPH_WIDTH - 1 - x)):
+                            glyph[x, y] = self._spectrum + 1 + index
+                glyphs[char] = glyph
+            self._glyphs.append(glyphs)
+        self._texts = [None] * len(value_colors)
+        self._line_height = height // len(value_colors)
+        self.bitmap.fill(self._spectrum)
+        self.render_time = 0  # Duration of the most recent render, seconds
+
+    def render(self, indices):
+        """Scale a grid of palette indices to the grid area of the panel."""
+        start = time.monotonic()
+        image = np.dot(np.dot(self._row_weights, indices), self._col_weights)
+        bitmaptools.arrayblit(
+            self.bitmap,
+            np.array(image, dtype=np.uint8),
+            self._x,
+            0,
+            self._x + self._size,
+            self._size,
+        )
+        self.render_time = time.monotonic() - start
+
+    def show(self, values, status=None):
+        """Show the sidebar value strings, top to bottom; the status message
+        is not shown."""
+        for index, text in enumerate(values):
+            self.set_value(index, text)
+
+    def set_value(self, index, text):
+        """Show a sidebar value; characters without a glyph show as blanks."""
+        text = f"{text:>{self._digits}s}"[-self._digits :]
+        if text == self._texts[index]:
+            return
+        self._texts[index] = text
+        glyphs = self._glyphs[index]
+        y = (index * self._line_height) + ((self._line_height - GLYPH_HEIGHT) // 2)
+        for position, char in enumerate(text):
+            bitmaptools.blit(
+                self.bitmap,
+                glyphs.get(char, glyphs[" "]),
+                position * (GLYPH_WIDTH + 1),
+                y,
+            )
@@ -0,0 +1,230 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_power`
+================================================================================
+Adaptive power and duty-cycle manager for battery operation; without activity
+the camera steps down from ACTIVE to IDLE (1 fps, dimmed) and SLEEP (stand-by).
+"""
+
+import time
+from ulab import numpy as np
+
+ACTIVE = "ACTIVE"
+IDLE = "IDLE"
+SLEEP = "SLEEP"
+
+# AMG88xx registers and values (from the sensor's data sheet)
+_PCTL = 0x00  # Power control
+_RST = 0x01  # Reset
+_FPSC = 0x02  # Frame rate
+_INTC = 0x03  # Interrupt control
+_SCLR = 0x05  # Status clear
+_INTHL = 0x08  # Interrupt upper threshold, then lower threshold and hysteresis
+_NORMAL_MODE = 0x00
+_STANDBY_10_MODE = 0x21
+_FLAG_RESET = 0x30
+_FPS_10 = 0x00
+_FPS_1 = 0x01
+_INT_ABSOLUTE = 0x03  # Interrupt enabled, absolute value mode
+_INT_CLEAR = 0x02
+
+
+class SensorControl:
+    """Power mode, frame rate, and interrupt control of an AMG88xx sensor.
+
+    ``adafruit_amg88xx`` reads the pixels and thermistor but has no public
+    interface for the power mode, frame rate, or interrupt registers, so this
+    helper writes them through the driver's ``i2c_device``. It is the only code
+    that addresses the sensor's registers directly.
+
+    :param sensor: The ``adafruit_amg88xx.AMG88XX`` sensor object.
+    """
+
+    def __init__(self, sensor):
+        self._device = sensor.i2c_device
+
+    def _write(self, register, data):
+        with self._device as i2c:
+            i2c.write(bytes([register]) + bytes(data))
+
+    def set_mode(self, standby=False):
+        """Select normal mode or the 10-second intermittent stand-by mode."""
+        self._write(_PCTL, [_STANDBY_10_MODE if standby else _NORMAL_MODE])
+        if not standby:
+            self._write(_RST, [_FLAG_RESET])
+
+    def set_fps(self, fps):
+        """Set the normal mode frame rate; 10 or 1 frames per second."""
+        self._write(_FPSC, [_FPS_1 if fps == 1 else _FPS_10])
+
+    def set_interrupt(self, threshold_c=None, hysteresis_c=1.0):
+        """Signal INT when a pixel reaches a Celsius threshold; None disables
+        the interrupt."""
+        if threshold_c is None:
+            self._write(_INTC, [0])
+            self.clear_interrupt()
+            return
+        # 12-bit two's complement values in 0.25 degree steps: upper threshold,
+        #   lower threshold (the minimum, never reached), and hysteresis
+        upper = max(-2048, min(2047, round(threshold_c * 4))) & 0xFFF
+        hysteresis = max(0, min(2047, round(hysteresis_c * 4)))
+        self._write(
+            _INTHL,
+            [upper & 0xFF, upper >> 8, 0x00, 0x08, hysteresis & 0xFF, hysteresis >> 8],
+        )
+        self.clear_interrupt()
+        self._write(_INTC, [_INT_ABSOLUTE])
+
+    def clear_interrupt(self):
+        """Clear the interrupt flag and release INT."""
+        self._write(_SCLR, [_INT_CLEAR])
+
+
+class PowerManager:
+    """Step the sensor, backlight, and CPU down when the scene is inactive.
+
+    :param sensor: The ``adafruit_amg88xx.AMG88XX`` sensor object.
+    :param display: The display object; its ``brightness`` is dimmed if it has
+      one.
+    :param float idle_time: Seconds without activity before IDLE. Defaults to 60.
+    :param float sleep_time: Seconds without activity before SLEEP.
+      Defaults to 600.
+    :param float threshold: Scene change in degrees that is activity.
+      Defaults to 2.0.
+    :param float brightness: ACTIVE backlight brightness. Defaults to 1.0.
+    :param float dim_brightness: IDLE backlight brightness. Defaults to 0.1.
+    :param float idle_interval: IDLE seconds between frames. Defaults to 1.0.
+    :param float sleep_interval: SLEEP seconds between frames. Defaults to 5.0.
+    :param int_pin: The pin connected to the sensor's INT output or None to
+      wake only at the pause interval. Defaults to None.
+    """
+
+    # pylint: disable=too-many-arguments, too-many-instance-attributes
+    def __init__(
+        self,
+        sensor,
+        display,
+        idle_time=60,
+        sleep_time=600,
+        threshold=2.0,
+        brightness=1.0,
+        dim_brightness=0.1,
+        idle_interval=1.0,
+        sleep_interval=5.0,
+        int_pin=None,
+    ):
+        self._sensor = SensorControl(sensor)
+        self._display = display if hasattr(display, "brightness") else None
+        self._idle_time = idle_time
+        self._sleep_time = sleep_time
+        self._threshold = threshold
+        self._brightness = {ACTIVE: brightness, IDLE: dim_brightness, SLEEP: 0}
+        self._interval = {ACTIVE: 0, IDLE: idle_interval, SLEEP: sleep_interval}
+        try:
+            import alarm  # pylint: disable=import-outside-toplevel
+
+            self._alarm = alarm
+        except ImportError:
+            self._alarm = None  # Pause with time.sleep instead
+        self._int_pin = int_pin if self._alarm else None
+        self.wake_threshold = None  # Sensor interrupt threshold in Celsius
+        self.woken = False  # True if the sensor interrupt ended the last pause
+        self.state = ACTIVE
+        self._reference = None  # Scene at the most recent activity
+        now = time.monotonic()
+        self._last_activity = now
+        self._last_update = now
+        self._start = now
+        self.state_time = {ACTIVE: 0, IDLE: 0, SLEEP: 0}  # Seconds in each state
+        self.sleep_time = 0  # Seconds of CPU light sleep
+        self._brightness_time = 0  # Integral of backlight brightness, seconds
+
+    @property
+    def cpu_duty(self):
+        """The fraction of time the CPU has been awake."""
+        elapsed = self._last_update - self._start
+        return 1 - (self.sleep_time / elapsed) if elapsed > 0 else 1
+
+    @property
+    def backlight_duty(self):
+        """The mean backlight brightness relative to the ACTIVE brightness."""
+        elapsed = self._last_update - self._start
+        if elapsed <= 0 or not self._brightness[ACTIVE]:
+            return 1
+        return self._brightness_time / (elapsed * self._brightness[ACTIVE])
+
+    @property
+    def sensor_sleep(self):
+        """The fraction of time the sensor has been in stand-by mode."""
+        elapsed = self._last_update - self._start
+        return self.state_time[SLEEP] / elapsed if elapsed > 0 else 0
+
+    def set_wake_threshold(self, threshold_c):
+        """Set the uncorrected sensor temperature in Celsius that wakes the
+        camera; usually the lowest alarm threshold."""
+        self.wake_threshold = threshold_c
+        if self.state != ACTIVE:
+            self._sensor.set_interrupt(threshold_c)
+
+    def update(self, data, alarm=False, key=False, now=None):
+        """Account for the elapsed time and change the power state; call once
+        per frame with the frame's sensor data and whether an alarm is active or
+        a key was pressed."""
+        if now is None:
+            now = time.monotonic()
+        elapsed = now - self._last_update
+        self.state_time[self.state] += elapsed
+        self._brightness_time += elapsed * self._brightness[self.state]
+        self._last_update = now
+
+        if (
+            alarm
+            or key
+            or self.woken
+            or self._reference is None
+            or np.max(abs(data - self._reference)) > self._threshold
+        ):
+            self.woken = False
+            self._reference = data
+            self._last_activity = now
+            if self.state != ACTIVE:
+                self._set_state(ACTIVE)
+        elif self.state == ACTIVE and now - self._last_activity >= self._idle_time:
+            self._set_state(IDLE)
+        elif self.state == IDLE and now - self._last_activity >= self._sleep_time:
+            self._set_state(SLEEP)
+
+    def pause(self):
+        """Wait in light sleep until the next frame of an IDLE or SLEEP state or
+        until the sensor interrupt; returns immediately when ACTIVE."""
+        interval = self._interval[self.state]
+        if not interval:
+            return
+        start = time.monotonic()
+        if self._alarm:
+            alarms = [self._alarm.time.TimeAlarm(monotonic_time=start + interval)]
+            if self._int_pin and self.wake_threshold is not None:
+                alarms.append(
+                    self._alarm.pin.PinAlarm(self._int_pin, value=False, pull=True)
+                )
+            woke = self._alarm.light_sleep_until_alarms(*alarms)
+            self.woken = isinstance(woke, self._alarm.pin.PinAlarm)
+        else:
+            time.sleep(interval)
+        self.sleep_time += time.monotonic() - start
+
+    def _set_state(self, state):
+        if state == ACTIVE:
+            self._sensor.set_interrupt(None)
+            self._sensor.set_mode(standby=False)
+            self._sensor.set_fps(10)
+        else:
+            self._sensor.set_mode(standby=state == SLEEP)
+            self._sensor.set_fps(1)
+            if self.wake_threshold is not None:
+                self._sensor.set_interrupt(self.wake_threshold)
+        if self._display:
+            self._display.brightness = self._brightness[state]
+        self.state = state
@@ -0,0 +1,146 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_quality`
+================================================================================
+Quality governor that trades image quality for a steady frame rate.
+
+The governor watches the smoothed frame processing time (excluding the time
+spent waiting for the display refresh) against the target frame time and
+steps through cumulative quality levels:
+
+=======  ===============================================================
+Level    Quality reduction
+=======  ===============================================================
+FULL     none
+BLOCKY   dirty-cell 15x15 image instead of the full-resolution smooth
+         image; the histogram writes only its changed cells
+COARSE   nearest-neighbor grid instead of bilinear interpolation
+LABELS   sidebar values are updated every ``interval`` frames
+STATS    frame statistics are calculated every ``interval`` frames
+=======  ===============================================================
+
+A level is dropped after ``patience`` consecutive frames over the target and
+restored after ``recovery`` consecutive frames under the ``headroom`` fraction
+of the target. A restored level that immediately misses the target again
+doubles the recovery period so the governor does not oscillate between two
+levels.
+"""
+
+LEVELS = ("FULL", "BLOCKY", "COARSE", "LABELS", "STATS")
+FULL = 0
+BLOCKY = 1
+COARSE = 2
+LABELS = 3
+STATS = 4
+
+
+class QualityGovernor:
+    """Step quality down when frames miss the target time and back up when
+    there is headroom.
+
+    :param float target: Target frame processing time in seconds.
+      Defaults to 0.1.
+    :param int interval: Frames between label and stats updates at the reduced
+      levels. Defaults to 3.
+    :param int patience: Consecutive late frames before stepping down.
+      Defaults to 3.
+    :param int recovery: Consecutive fast frames before stepping up.
+      Defaults to 30.
+    :param float headroom: Fraction of the target a frame must finish within to
+      count toward recovery. Defaults to 0.7.
+    :param float alpha: Frame time smoothing factor (0 to 1). Defaults to 0.3.
+    """
+
+    # pylint: disable=too-many-arguments, too-many-instance-attributes
+    def __init__(
+        self,
+        target=0.1,
+        interval=3,
+        patience=3,
+        recovery=30,
+        headroom=0.7,
+        alpha=0.3,
+    ):
+        self.target = target
+        self._interval = interval
+        self._patience = patience
+        self._base_recovery = recovery
+        self._recovery = recovery
+        self._headroom = headroom
+        self._alpha = alpha
+        self.level = FULL
+        self.frame_time = 0  # Smoothed frame processing time, seconds
+        self.frames = 0
+        self._late = 0  # Consecutive late frames
+        self._fast = 0  # Consecutive frames with headroom
+        self._frames_at_level = 0
+        self._raised = False  # The current level was restored
+        self.changes = 0  # Number of level changes
+
+    @property
+    def name(self):
+        """The name of the current quality level."""
+        return LEVELS[self.level]
+
+    @property
+    def smooth(self):
+        """True if the full-resolution smooth image is allowed."""
+        return self.level < BLOCKY
+
+    @property
+    def coarse(self):
+        """True if the grid uses nearest-neighbor rather than bilinear
+        interpolation."""
+        return self.level >= COARSE
+
+    @property
+    def labels(self):
+        """True if the sidebar values are updated this frame."""
+        return self.level < LABELS or not self.frames % self._interval
+
+    @property
+    def stats(self):
+        """True if the frame statistics are calculated this frame."""
+        return self.level < STATS or not self.frames % self._interval
+
+    def update(self, frame_time):
+        """Record a frame's processing time in seconds and change the quality
+        level if needed. Returns True if the level changed."""
+        self.frames += 1
+        self._frames_at_level += 1
+        if self._frames_at_level == 1:
+            self.frame_time = frame_time  # Measure the new level on its own
+        else:
+            self.frame_time += self._alpha * (frame_time - self.frame_time)
+        if self.frame_time > self.target:
+            self._late += 1
+            self._fast = 0
+        elif self.frame_time < self._headroom * self.target:
+            self._fast += 1
+            self._late = 0
+        else:
+            self._late = 0
+            self._fast = 0
+
+        if self._late >= self._patience and self.level < STATS:
+            if self._raised and self._frames_at_level <= self._recovery:
+                # The restored level was too slow; wait longer before retrying
+                self._recovery = min(2 * self._recovery, 32 * self._base_recovery)
+            self._set_level(self.level + 1)
+            return True
+        if self._fast >= self._recovery and self.level > FULL:
+            self._set_level(self.level - 1)
+            return True
+        if self._frames_at_level > 4 * self._recovery:
+            self._recovery = self._base_recovery  # The level has held
+        return False
+
+    def _set_level(self, level):
+        self._raised = level < self.level
+        self.level = level
+        self._late = 0
+        self._fast = 0
+        self._frames_at_level = 0
+        self.changes += 1
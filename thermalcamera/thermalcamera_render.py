@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_render`
+================================================================================
+Full-resolution smooth thermal image renderer.
+
+Upscales the 8x8 sensor data to the full display grid size with separable
+linear interpolation computed as two ``ulab`` matrix products, maps the result
+to palette indices, and writes the indices into a ``displayio.Bitmap`` one band
+of rows at a time with ``bitmaptools.arrayblit``. There is no per-pixel Python
+loop. The image orientation (rear or selfie view) is folded into the
+precomputed interpolation matrices so flipping costs nothing per frame.
+"""
+
+import time
+import displayio
+import bitmaptools
+from ulab import numpy as np
+
+
+def interpolation_matrix(size_out, size_in):
+    """Build a ``size_out`` x ``size_in`` linear interpolation weight matrix. The
+    first and last output samples align with the first and last input samples."""
+    weights = np.zeros((size_out, size_in))
+    step = (size_in - 1) / (size_out - 1)
+    for out in range(size_out):
+        position = out * step
+        index = min(int(position), size_in - 2)
+        fraction = position - index
+        weights[out, index] = 1 - fraction
+        weights[out, index + 1] = fraction
+    return weights
+
+
+def build_palette(colors):
+    """Build a ``displayio.Palette`` from a list of RGB color values."""
+    palette = displayio.Palette(len(colors))
+    for i, color in enumerate(colors):
+        palette[i] = color
+    return palette
+
+
+class SmoothRenderer:
+    """Render normalized sensor data into a full-resolution palette bitmap.
+
+    :param int size: Bitmap width and height in pixels (the display grid size).
+    :param palette: The ``displayio.Palette`` color lookup table.
+    :param int sensor_axis: Sensor data axis size. Defaults to 8.
+    :param bool selfie: True for the front (selfie) view. Defaults to False.
+    :param int band: Number of bitmap rows interpolated and written per
+      ``arrayblit`` call; bounds the working memory. Defaults to 16.
+    :param int x: Bitmap x position on the display. Defaults to 0.
+    :param int y: Bitmap y position on the display. Defaults to 0.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self, size, palette, sensor_axis=8, selfie=False, band=16, x=0, y=0
+    ):
+        self._size = size
+        self._band = band
+        self._max_index = len(palette) - 1
+        self.bitmap = displayio.Bitmap(size, size, len(palette))
+        self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=palette, x=x, y=y)
+
+        # Sensor rows are displayed bottom-to-top; columns are mirrored for the
+        # rear view. Reversing the weight rows performs the flip.
+        weights = interpolation_matrix(size, sensor_axis)
+        self._row_weights = weights[::-1, :]
+        if selfie:
+            self._col_weights = weights.transpose()
+        else:
+            self._col_weights = weights[::-1, :].transpose()
+        self.render_time = 0  # Duration of the most recent render, seconds
+
+    @property
+    def max_rate(self):
+        """The render-only frame rate (frames/sec) the renderer can hold based on
+        the most recent render time."""
+        if self.render_time > 0:
+            return 1 / self.render_time
+        return 0
+
+    def render(self, data):
+        """Interpolate normalized (0.0 to 1.0) sensor data to the bitmap."""
+        start = time.monotonic()
+        columns = np.dot(data, self._col_weights)  # sensor_axis x size
+        for row in range(0, self._size, self._band):
+            end = min(row + self._band, self._size)
+            band = np.dot(self._row_weights[row:end, :], columns)
+            band = np.clip(band * self._max_index + 0.5, 0, self._max_index)
+            bitmaptools.arrayblit(
+                self.bitmap,
+                np.array(band, dtype=np.uint8),
+                0,
+                row,
+                self._size,
+                end,
+            )
+        self.render_time = time.monotonic() - start
@@ -0,0 +1,156 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_settings`
+================================================================================
+Persistent settings store in non-volatile memory (``microcontroller.nvm``).
+
+Settings are kept in one compact, versioned ``struct`` record protected by a
+CRC-32 checksum. The record is read and verified with a single NVM read at boot;
+a missing, outdated, or corrupted record is replaced by the factory defaults from
+``thermalcamera_config.py``. Only the values that can be changed on the device
+(the alarm and range values in setup mode and the flat-field calibration) are
+stored; every other setting is read from the configuration file at each boot so
+that configuration changes are never overridden by a stored copy.
+
+Changes are written after a quiet delay so that a burst of changes, such as
+holding the joystick while adjusting a value, is coalesced into one write. The
+record is compared with the stored copy and only written when it differs, which
+limits NVM wear.
+
+Record layout (little-endian)::
+
+    magic "TCST", version (B)
+    alarm_f, min_range_f, max_range_f (h)
+    calibration tables (packed bytes)
+    CRC-32 of all of the above (I)
+"""
+
+import time
+import struct
+from binascii import crc32
+
+_MAGIC = b"TCST"
+_VERSION = 2
+
+# Scalar settings in record order: (name, struct format character)
+_FIELDS = (
+    ("alarm_f", "h"),
+    ("min_range_f", "h"),
+    ("max_range_f", "h"),
+)
+
+
+class SettingsStore:
+    """Versioned, CRC-protected settings record with delayed writes.
+
+    :param nvm: The non-volatile memory bytearray (``microcontroller.nvm``) or
+      ``None`` to keep settings in memory only.
+    :param dict defaults: The factory default values for every scalar setting
+      and ``"calibration"`` (packed calibration bytes).
+    :param int start: The record's starting location in NVM. Defaults to 0.
+    :param float delay: Seconds without changes before a write. Defaults to 5.0.
+    :param float max_delay: Maximum seconds from the first change to the write.
+      Defaults to 30.0.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, nvm, defaults, start=0, delay=5.0, max_delay=30.0):
+        self._nvm = nvm
+        self._start = start
+        self._delay = delay
+        self._max_delay = max_delay
+        self._calibration_size = len(defaults["calibration"])
+        self._format = (
+            "<4sB"
+            + "".join(code for _, code in _FIELDS)
+            + f"{self._calibration_size}s"
+        )
+        self.size = struct.calcsize(self._format) + 4  # Record and CRC-32
+        self.defaults = defaults
+        self.values = dict(defaults)
+        self.loaded = False  # True if the values were loaded from NVM
+        self._deadline = None  # Time of the pending write
+        self._first_change = 0
+
+    @property
+    def pending(self):
+        """True while a write is scheduled."""
+        return self._deadline is not None
+
+    def load(self):
+        """Load the stored record; returns False and keeps the defaults if the
+        record is missing, outdated, or corrupted."""
+        self.loaded = False
+        if self._nvm is None or self._start + self.size > len(self._nvm):
+            return False
+        record = bytes(self._nvm[self._start : self._start + self.size])
+        if record[:4] != _MAGIC or record[4] != _VERSION:
+            return False
+        (checksum,) = struct.unpack("<I", record[-4:])
+        if crc32(record[:-4]) != checksum:
+            return False
+        self.values = self._unpack(record[:-4])
+        self.loaded = True
+        return True
+
+    def set(self, name, value, now=None):
+        """Change a setting and schedule a delayed write if it differs from the
+        current value."""
+        if self.values.get(name) == value:
+            return
+        self.values[name] = value
+        if now is None:
+            now = time.monotonic()
+        if self._deadline is None:
+            self._first_change = now
+        self._deadline = min(now + self._delay, self._first_change + self._max_delay)
+
+    def reset(self):
+        """Restore the factory defaults and schedule a write."""
+        for name, value in self.defaults.items():
+            self.set(name, value)
+
+    def service(self, now=None):
+        """Write the record if a scheduled write is due; call once per frame.
+        Returns True if the record was written."""
+        if self._deadline is None:
+            return False
+        if now is None:
+            now = time.monotonic()
+        if now < self._deadline:
+            return False
+        return self.flush()
+
+    def flush(self):
+        """Write the record now if it differs from the stored copy; returns
+        True if the record was written. A record that does not fit in NVM is
+        not written."""
+        self._deadline = None
+        if self._nvm is None or self._start + self.size > len(self._nvm):
+            return False
+        record = self._pack()
+        record += struct.pack("<I", crc32(record))
+        end = self._start + len(record)
+        if bytes(self._nvm[self._start : end]) == record:
+            return False
+        self._nvm[self._start : end] = record
+        return True
+
+    def _pack(self):
+        return struct.pack(
+            self._format,
+            _MAGIC,
+            _VERSION,
+            *(self.values[name] for name, _ in _FIELDS),
+            self.values["calibration"],
+        )
+
+    def _unpack(self, record):
+        fields = struct.unpack(self._format, record)
+        values = dict(self.defaults)
+        for index, (name, _) in enumerate(_FIELDS):
+            values[name] = fields[2 + index]
+        values["calibration"] = fields[-1]
+        return values
@@ -0,0 +1,195 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_setup`
+================================================================================
+Event-driven setup mode state machine for the alarm threshold and the
+minimum/maximum display range values.
+
+Setup mode never takes over the primary process loop. Button events are passed
+to ``handle_key()`` as they arrive and ``update()`` is called once per frame with
+the current joystick sample to advance label blinking and joystick auto-repeat
+by deadline. The live image, alarm checks, and the rest of the frame continue
+at full rate while values are being adjusted.
+"""
+
+import time
+from thermalcamera_status import PRIORITY_INFO, PRIORITY_SETUP
+
+# Setup states
+IDLE = "IDLE"
+SELECT_PARAM = "SELECT_PARAM"
+ADJUST_VALUE = "ADJUST_VALUE"
+
+# Status key of the parameter prompt; prompt texts may match other messages
+_PROMPT_KEY = "setup prompt"
+
+
+class SetupParam:
+    """A settable parameter and its on-screen caption and value labels.
+
+    :param str name: The status text shown while the parameter is selected.
+    :param caption: The parameter's caption label.
+    :param value: The parameter's value label.
+    :param int color: The parameter's normal text color.
+    """
+
+    def __init__(self, name, caption, value, color):
+        self.name = name
+        self.caption = caption
+        self.value = value
+        self.color = color
+
+
+class SetupMode:
+    """Non-blocking alarm and range setup state machine.
+
+    :param list params: The ``SetupParam`` objects in selection order.
+    :param status: The ``StatusOverlay`` used for setup prompts.
+    :param dict keys: Key numbers for the ``"up"``, ``"down"``, ``"enter"``, and
+      ``"exit"`` actions and an optional ``"calibrate"`` action that leaves
+      setup mode and requests a flat-field calibration.
+    :param tuple value_range: Minimum and maximum parameter values.
+      Defaults to (32, 157).
+    :param float repeat: Joystick auto-repeat interval in seconds. Defaults to 0.25.
+    :param function click: Optional function called to acknowledge ``enter``
+      and ``exit`` key presses.
+    :param list hide: Optional ``(label, color)`` pairs hidden during setup mode
+      and restored to color on exit.
+    """
+
+    # pylint: disable=too-many-arguments, too-many-instance-attributes
+    def __init__(
+        self,
+        params,
+        status,
+        keys,
+        value_range=(32, 157),
+        repeat=0.25,
+        click=None,
+        hide=(),
+    ):
+        self._params = params
+        self._status = status
+        self._keys = keys
+        self._value_range = value_range
+        self._repeat = repeat
+        self._click = click
+        self._hide = hide
+        self.state = IDLE
+        self.values = [0] * len(params)
+        self.changed = False  # True when values have changed since last checked
+        self.calibrate = False  # True when calibration was requested; cleared by caller
+        self._index = 0
+        self._blink_deadline = 0
+        self._blink_on = True
+        self._repeat_deadline = 0
+
+    @property
+    def active(self):
+        """True while setup mode is active."""
+        return self.state != IDLE
+
+    def enter(self, values):
+        """Start setup mode with the current parameter values."""
+        self.values = list(values)
+        for param, value in zip(self._params, self.values):
+            param.value.text = str(value)
+        for label, _ in self._hide:
+            label.color = None
+        self._status.post("-SET-", 0.8, PRIORITY_SETUP)
+        self._index = 0
+        self._select(SELECT_PARAM)
+
+    def exit(self):
+        """Leave setup mode and restore the parameter label colors."""
+        self._restore()
+        for label, color in self._hide:
+            label.color = color
+        self._status.clear(_PROMPT_KEY)
+        self._status.post("RESUME", 0.5, PRIORITY_INFO)
+        self.state = IDLE
+
+    def handle_key(self, key_number):
+        """Act on a pressed key; returns True if setup mode consumed the key."""
+        if not self.active:
+            return False
+        if key_number == self._keys["exit"]:
+            self._acknowledge()
+            self.exit()
+        elif key_number == self._keys.get("calibrate"):
+            self._acknowledge()
+            self.exit()
+            self.calibrate = True
+        elif key_number == self._keys["enter"]:
+            self._acknowledge()
+            self._restore()
+            self._select(ADJUST_VALUE if self.state == SELECT_PARAM else SELECT_PARAM)
+        elif key_number == self._keys["up"]:
+            self._step(1)
+        elif key_number == self._keys["down"]:
+            self._step(-1)
+        return True
+
+    def update(self, joystick=0, now=None):
+        """Advance blinking and joystick auto-repeat; call once per frame.
+        Joystick is +1 for up, -1 for down, or 0 when centered."""
+        if not self.active:
+            return
+        if now is None:
+            now = time.monotonic()
+        if joystick and now >= self._repeat_deadline:
+            self._repeat_deadline = now + self._repeat
+            self._step(joystick)
+        elif not joystick:
+            self._repeat_deadline = 0
+
+        if now >= self._blink_deadline:
+            param = self._params[self._index]
+            self._blink_on = not self._blink_on
+            if self.state == SELECT_PARAM:
+                self._blink_deadline = now + 0.25
+                param.caption.color = param.color if self._blink_on else None
+            else:
+                # Value blinks off briefly so that it remains readable
+                self._blink_deadline = now + (0.2 if self._blink_on else 0.05)
+                param.value.color = param.color if self._blink_on else None
+
+    def _step(self, direction):
+        """Move the parameter selection or adjust the selected value."""
+        if self.state == SELECT_PARAM:
+            # Parameters are listed top to bottom; up selects the previous one
+            index = max(0, min(len(self._params) - 1, self._index - direction))
+            if index != self._index:
+                self._restore()
+                self._index = index
+                self._select(SELECT_PARAM)
+        else:
+            value = self.values[self._index] + direction
+            value = max(self._value_range[0], min(self._value_range[1], value))
+            if value != self.values[self._index]:
+                self.values[self._index] = value
+                self._params[self._index].value.text = str(value)
+                self.changed = True
+
+    def _select(self, state):
+        self.state = state
+        self._status.post(
+            self._params[self._index].name,
+            None,
+            PRIORITY_SETUP,
+            blink=0.25,
+            key=_PROMPT_KEY,
+        )
+        self._blink_deadline = 0
+        self._blink_on = False
+
+    def _restore(self):
+        param = self._params[self._index]
+        param.caption.color = param.color
+        param.value.color = param.color
+
+    def _acknowledge(self):
+        if self._click:
+            self._click()
@@ -0,0 +1,47 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_slots`
+================================================================================
+Stand-ins for the displayio labels and shapes on boards whose display is drawn
+by a full-frame renderer (the Dazzler's EVE coprocessor or the MatrixPortal's
+panel bitmap).
+
+The primary process loop, the status overlay, and setup mode change the text,
+color, and visibility of the user interface elements in the same way on every
+board. On a full-frame renderer board those elements are slots that only hold
+their attributes; the renderer reads the slots when it draws the frame. A
+``None`` color hides a slot, as it does a ``Label``.
+"""
+
+
+class Slot:
+    """The attributes of a label or shape.
+
+    :param str text: The initial text. Defaults to "".
+    :param int color: The initial RGB color or None for hidden. Defaults to None.
+    :param attributes: Any other initial attributes, such as ``outline``.
+    """
+
+    def __init__(self, text="", color=None, **attributes):
+        self.text = text
+        self.color = color
+        self.hidden = False
+        self.anchor_point = (0, 0)
+        self.anchored_position = (0, 0)
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
+    @property
+    def shown(self):
+        """The text if the slot is visible, otherwise an empty string."""
+        if self.hidden or self.color is None:
+            return ""
+        return self.text
+
+
+class SlotGroup(list):
+    """A list of slots with the ``hidden`` attribute of a ``displayio.Group``."""
+
+    hidden = False
@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_stats`
+================================================================================
+Per-frame temperature statistics helper.
+
+Calculates the maximum, minimum, mean, standard deviation, the locations of the
+maximum and minimum, and the 5th and 95th percentiles of a frame. For frames
+small enough to sort (such as the 64 sensor pixels), a single sort provides the
+minimum, maximum, and exact percentiles at once; the mean and standard deviation
+come from one sum and one dot product. Larger frames use a cumulative histogram
+to estimate percentiles.
+"""
+
+import math
+from ulab import numpy as np
+
+
+class FrameStats:
+    """Temperature statistics for a frame of data.
+
+    :param int axis: Frame row length, used to convert a flat index to a
+      (row, column) location. Defaults to 8.
+    :param int bins: Number of histogram bins for percentile estimation of large
+      frames. Defaults to 32.
+    :param int sort_limit: Largest frame size for exact (sorted) percentiles.
+      Defaults to 256.
+    """
+
+    def __init__(self, axis=8, bins=32, sort_limit=256):
+        self._axis = axis
+        self._bins = bins
+        self._sort_limit = sort_limit
+        self.max = 0
+        self.min = 0
+        self.mean = 0
+        self.std = 0
+        self.p5 = 0  # 5th percentile
+        self.p95 = 0  # 95th percentile
+        self.max_loc = (0, 0)  # (row, column) of the maximum
+        self.min_loc = (0, 0)  # (row, column) of the minimum
+
+    @property
+    def span(self):
+        """The 5th to 95th percentile span; ignores outlier pixels."""
+        return self.p95 - self.p5
+
+    def update(self, data):
+        """Calculate the statistics of a frame of data; returns self."""
+        size = data.size
+        flat = data.reshape((size,))
+        if size <= self._sort_limit:
+            ordered = np.sort(flat)
+            self.min = ordered[0]
+            self.max = ordered[-1]
+            self.p5 = self._sorted_percentile(ordered, 5)
+            self.p95 = self._sorted_percentile(ordered, 95)
+        else:
+            self.min = np.min(flat)
+            self.max = np.max(flat)
+            self.p5, self.p95 = self.histogram_percentiles(flat, (5, 95))
+
+        total = np.sum(flat)
+        self.mean = total / size
+        variance = (np.dot(flat, flat) / size) - (self.mean * self.mean)
+        self.std = math.sqrt(max(0, variance))
+
+        index = int(np.argmax(flat))
+        self.max_loc = (index // self._axis, index % self._axis)
+        index = int(np.argmin(flat))
+        self.min_loc = (index // self._axis, index % self._axis)
+        return self
+
+    def cumulative_histogram(self, flat, low=None, high=None):
+        """Cumulative counts of values below each of ``bins + 1`` equally spaced
+        bin edges from low to high (default: the frame minimum and maximum).
+        Returns the bin edges and counts as arrays."""
+        if low is None:
+            low = self.min
+        if high is None:
+            high = self.max
+        edges = np.linspace(low, high, self._bins + 1)
+        counts = np.zeros(self._bins + 1)
+        for i in range(self._bins + 1):
+            counts[i] = np.sum(flat < edges[i])
+        counts[-1] = flat.size  # The last edge includes the maximum value
+        return edges, counts
+
+    def histogram_percentiles(self, flat, percentiles):
+        """Estimate percentiles from the cumulative histogram by linear
+        interpolation within a bin."""
+        edges, counts = self.cumulative_histogram(flat, self.min, self.max)
+        results = []
+        for percentile in percentiles:
+            rank = percentile / 100 * flat.size
+            results.append(np.interp(np.array([rank]), counts, edges)[0])
+        return results
+
+    @staticmethod
+    def _sorted_percentile(ordered, percentile):
+        position = percentile / 100 * (ordered.size - 1)
+        index = int(position)
+        fraction = position - index
+        if index + 1 >= ordered.size:
+            return ordered[-1]
+        return ordered[index] + fraction * (ordered[index + 1] - ordered[index])
@@ -0,0 +1,148 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_status`
+================================================================================
+Non-blocking status message overlay manager.
+
+Messages are scheduled by deadline and the overlay is serviced once per frame
+from the primary process loop; nothing here ever sleeps. A higher priority
+message preempts the one on display; equal or lower priority messages wait in
+the queue. A message posted with ``duration=None`` is persistent and remains
+queued until cleared, which is how the HOLD status is shown while the display
+is frozen. Messages are identified by a key, which is the message text unless
+another key is given, so producers that show the same text (such as the ALARM
+setup prompt and the ALARM temperature alarm) do not replace or clear each
+other's messages.
+"""
+
+import time
+
+# Message priorities; higher values preempt lower values
+PRIORITY_INFO = 0  # Mode changes and acknowledgements (IRON, FOCUS, RESUME)
+PRIORITY_HOLD = 1  # Persistent display state (HOLD)
+PRIORITY_SETUP = 2  # Setup mode prompts (SET, ALARM, RANGE)
+PRIORITY_ALARM = 3  # Temperature alarm
+
+
+class StatusOverlay:
+    """Schedule and display status messages on a text label without blocking.
+
+    :param label: The status text label (``adafruit_display_text.label.Label``).
+    :param int color: The default message text color. Defaults to white.
+    :param int max_queue: Maximum number of waiting messages. Defaults to 4.
+    """
+
+    def __init__(self, label, color=0xFFFFFF, max_queue=4):
+        self._label = label
+        self._color = color
+        self._max_queue = max_queue
+        # Waiting messages: [priority, text, duration, blink, color, key]
+        self._queue = []
+        self._current = None  # Message on display
+        self._deadline = 0  # Time to remove the current message
+        self._blink_deadline = 0  # Time of next blink toggle
+        self._visible = False
+
+    @property
+    def text(self):
+        """The message currently on display or an empty string."""
+        if self._current:
+            return self._current[1]
+        return ""
+
+    # pylint: disable=too-many-arguments
+    def post(
+        self, text, duration=0.5, priority=PRIORITY_INFO, blink=0, color=None, key=None
+    ):
+        """Queue a status message. Duration is in seconds; ``None`` keeps the
+        message until cleared. A non-zero blink period in seconds flashes the
+        message text while it is displayed. A message replaces the message with
+        the same key; the key defaults to the text."""
+        if color is None:
+            color = self._color
+        if key is None:
+            key = text
+        message = [priority, text, duration, blink, color, key]
+        if self._current and self._current[5] == key:
+            # Replace the message on display rather than queueing a duplicate
+            self._show(message)
+            return
+        for queued in self._queue:
+            if queued[5] == key:
+                queued[:] = message
+                return
+        if self._current and priority > self._current[0]:
+            # Preempt the current message; keep it queued if it is persistent
+            if self._current[2] is None:
+                self._enqueue(self._current)
+            self._show(message)
+            return
+        self._enqueue(message)
+
+    def clear(self, key=None):
+        """Remove a message by key (its text unless posted with another key), or
+        all messages if key is None."""
+        if key is None:
+            self._queue = []
+            self._current = None
+            self._deadline = 0
+        else:
+            self._queue = [queued for queued in self._queue if queued[5] != key]
+            if self._current and self._current[5] == key:
+                self._current = None
+                self._deadline = 0
+        if self._current is None:
+            self._hide()
+
+    def service(self, now=None):
+        """Advance message display and blinking; call once per frame."""
+        if now is None:
+            now = time.monotonic()
+        if self._current and self._deadline and now >= self._deadline:
+            self._current = None
+            self._hide()
+        if self._current is None:
+            if not self._queue:
+                return
+            self._show(self._queue.pop(0), now)
+        blink = self._current[3]
+        if blink and now >= self._blink_deadline:
+            self._blink_deadline = now + blink
+            self._visible = not self._visible
+            self._label.color = self._current[4] if self._visible else None
+
+    def _enqueue(self, message):
+        """Insert a message after waiting messages of equal or higher priority."""
+        index = len(self._queue)
+        for i, queued in enumerate(self._queue):
+            if message[0] > queued[0]:
+                index = i
+                break
+        self._queue.insert(index, message)
+        if len(self._queue) > self._max_queue:
+            self._queue.pop()  # Drop the lowest priority, most recent message
+
+    def _show(self, message, now=None):
+        if now is None:
+            now = time.monotonic()
+        self._current = message
+        self._deadline = self._expiry(message[2], now)
+        self._blink_deadline = now + message[3]
+        self._visible = True
+        self._label.text = message[1]
+        self._label.color = message[4]
+
+    def _hide(self):
+        self._visible = False
+        self._label.color = None
+        self._label.text = ""
+
+    @staticmethod
+    def _expiry(duration, now=None):
+        if duration is None:
+            return 0
+        if now is None:
+            now = time.monotonic()
+        return now + duration
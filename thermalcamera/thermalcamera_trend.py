@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_trend`
+================================================================================
+Rate-of-rise temperature trend helper; a least-squares slope of each value over
+a rolling window of timed samples, updated from running sums.
+"""
+
+import time
+from ulab import numpy as np
+
+
+class RateOfRise:
+    """Least-squares rate of temperature rise over a rolling window.
+
+    :param int size: Number of values in each sample, e.g. 64 sensor pixels.
+    :param int window: Number of samples in the rolling window. Defaults to 30.
+    :param float interval: Minimum sampling interval in seconds. Defaults to 2.0.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, size, window=30, interval=2.0):
+        self._size = size
+        self._window = window
+        self.interval = interval
+        self._history = np.zeros((window, size))
+        self._times = [0] * window  # Sample times relative to the time base
+        self.rate = np.zeros(size)  # Rate of rise in degrees per minute
+        self.reset()
+
+    @property
+    def ready(self):
+        """True once at least half of the window has been sampled."""
+        return self._count >= max(2, self._window // 2)
+
+    def reset(self):
+        """Discard the sample history."""
+        self._sum_x = 0
+        self._sum_xx = 0
+        self._sum_y = np.zeros(self._size)
+        self._sum_xy = np.zeros(self._size)
+        self._base = None  # Time base of the sample times
+        self._head = 0  # History index of the next (and oldest) sample
+        self._count = 0  # Number of samples in the window
+        self._samples = 0  # Samples since the sums were last recalculated
+        self._next_sample = 0
+        self.rate = np.zeros(self._size)
+        self.max_rate = 0  # Maximum rate of rise in degrees per minute
+
+    def update(self, values, now=None):
+        """Add a sample of values (any shape with ``size`` elements) if the
+        sampling interval has elapsed and update the rates of rise. Returns
+        True if a sample was taken."""
+        if now is None:
+            now = time.monotonic()
+        if now < self._next_sample:
+            return False
+        self._next_sample = now + self.interval
+        if self._count:
+            newest = self._times[(self._head - 1) % self._window]
+            if now - self._base - newest > self._window * self.interval:
+                self.reset()  # The history is older than a window
+                self._next_sample = now + self.interval
+        if self._base is None:
+            self._base = now
+
+        x = now - self._base
+        values = values.reshape((self._size,))
+        if self._count < self._window:
+            self._count += 1
+        else:
+            x_0 = self._times[self._head]
+            oldest = self._history[self._head]
+            self._sum_x -= x_0
+            self._sum_xx -= x_0 * x_0
+            self._sum_y -= oldest
+            self._sum_xy -= x_0 * oldest
+        self._sum_x += x
+        self._sum_xx += x * x
+        self._sum_y += values
+        self._sum_xy += x * values
+        self._history[self._head] = values
+        self._times[self._head] = x
+        self._head = (self._head + 1) % self._window
+
+        self._samples += 1
+        if self._samples >= self._window:
+            self._recalculate()
+
+        count = self._count
+        denominator = (count * self._sum_xx) - (self._sum_x * self._sum_x)
+        if count > 1 and denominator > 0:
+            slope = ((count * self._sum_xy) - (self._sum_x * self._sum_y)) / denominator
+            self.rate = slope * 60  # Degrees per second to degrees per minute
+            self.max_rate = np.max(self.rate)
+        return True
+
+    def _recalculate(self):
+        """Recalculate the running sums exactly from the sample history with
+        the times measured from the oldest sample."""
+        self._samples = 0
+        oldest = (self._head - self._count) % self._window
+        shift = self._times[oldest]
+        self._base += shift
+        self._sum_x = 0
+        self._sum_xx = 0
+        self._sum_y = np.zeros(self._size)
+        self._sum_xy = np.zeros(self._size)
+        for i in range(self._count):
+            index = (oldest + i) % self._window
+            x = self._times[index] - shift
+            values = self._history[index]
+            self._times[index] = x
+            self._sum_x += x
+            self._sum_xx += x * x
+            self._sum_y += values
+            self._sum_xy += x * values
@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`thermalcamera_zones`
+================================================================================
+Multi-zone temperature alarm helpers.
+
+Each zone is a rectangle or an arbitrary mask of sensor pixels with its own
+alarm threshold, hysteresis, and alarm tone. Zone masks are precomputed as one
+``ulab`` matrix so that the maximum and average temperature of every zone are
+calculated in a single vectorized pass per frame.
+
+Zones are defined in ``thermalcamera_config.py`` as a list of dictionaries::
+
+    ZONES = [
+        {"name": "ENTRY", "rect": (0, 0, 7, 2), "alarm_f": 120},
+        {"name": "MIDDLE", "rect": (0, 3, 7, 4), "alarm_f": 120, "tone": 988},
+        {"name": "END", "mask": ["......XX"] * 8, "alarm_f": 110, "hysteresis_f": 5},
+        {"name": "DUCT", "rect": (2, 0, 5, 7), "alarm_f": 140, "emissivity": 0.3},
+    ]
+
+A ``rect`` is (first row, first column, last row, last column) of sensor pixels,
+inclusive. A ``mask`` is a list of strings, one per sensor row, with ``X`` for
+each included pixel. ``hysteresis_f`` (default 3) is the drop below the alarm
+threshold needed to clear an alarm; ``tone`` (default 880) is the alarm tone
+frequency in Hz. ``emissivity`` (default: the configured default emissivity) is
+the emissivity of the zone's surface used for ambient compensation.
+"""
+
+from ulab import numpy as np
+from thermalcamera_converters import f_to_c, delta_f_to_c
+
+# Added to pixels outside of a zone so that they never become the zone maximum
+_OUTSIDE = -1000
+
+
+class Zone:
+    """A sensor pixel zone and its alarm settings and state.
+
+    :param dict definition: The zone definition from the configuration file.
+    :param int sensor_axis: Sensor data axis size. Defaults to 8.
+    """
+
+    def __init__(self, definition, sensor_axis=8):
+        self.name = definition["name"]
+        self.alarm_f = definition.get("alarm_f", 120)
+        self.hysteresis_f = definition.get("hysteresis_f", 3)
+        self.tone = definition.get("tone", 880)
+        self.emissivity = definition.get("emissivity", None)
+        self.mask = [0] * (sensor_axis**2)
+        if "rect" in definition:
+            row_0, col_0, row_1, col_1 = definition["rect"]
+            for row in range(row_0, row_1 + 1):
+                for col in range(col_0, col_1 + 1):
+                    self.mask[row * sensor_axis + col] = 1
+        else:
+            for row, pixels in enumerate(definition["mask"]):
+                for col, pixel in enumerate(pixels):
+                    if pixel in "Xx#":
+                        self.mask[row * sensor_axis + col] = 1
+        if not any(self.mask):
+            raise ValueError(f"Zone {self.name} has no sensor pixels")
+
+        # Bounding box of the zone's pixels; (row_0, col_0, row_1, col_1)
+        rows = [i // sensor_axis for i, pixel in enumerate(self.mask) if pixel]
+        cols = [i % sensor_axis for i, pixel in enumerate(self.mask) if pixel]
+        self.bounds = (min(rows), min(cols), max(rows), max(cols))
+
+        self.alarm = False  # True while the zone is in alarm
+        self.max_c = 0  # Zone maximum temperature
+        self.ave_c = 0  # Zone average temperature
+
+    @property
+    def alarm_f(self):
+        """The zone alarm threshold in degrees Fahrenheit."""
+        return self._alarm_f
+
+    @alarm_f.setter
+    def alarm_f(self, alarm_f):
+        self._alarm_f = alarm_f
+        self.alarm_c = f_to_c(alarm_f)
+
+    @property
+    def hysteresis_f(self):
+        """The zone alarm hysteresis in degrees Fahrenheit."""
+        return self._hysteresis_f
+
+    @hysteresis_f.setter
+    def hysteresis_f(self, hysteresis_f):
+        self._hysteresis_f = hysteresis_f
+        self.hysteresis_c = delta_f_to_c(hysteresis_f)
+
+    def grid_bounds(self, grid_axis, selfie=False):
+        """The zone's bounding box in display grid cells as (first column,
+        first row, last column, last row) for a 2x interpolated grid displayed
+        bottom-to-top and, except for the selfie view, mirrored."""
+        row_0, col_0, row_1, col_1 = self.bounds
+        top = grid_axis - 1 - (2 * row_1)
+        bottom = grid_axis - 1 - (2 * row_0)
+        if selfie:
+            return 2 * col_0, top, 2 * col_1, bottom
+        return grid_axis - 1 - (2 * col_1), top, grid_axis - 1 - (2 * col_0), bottom
+
+
+class ZoneMonitor:
+    """Calculate zone statistics and alarm states for a list of zones.
+
+    :param list definitions: Zone definitions from the configuration file.
+    :param int sensor_axis: Sensor data axis size. Defaults to 8.
+    """
+
+    def __init__(self, definitions, sensor_axis=8):
+        self.zones = [Zone(definition, sensor_axis) for definition in definitions]
+        self._size = sensor_axis**2
+        if self.zones:
+            self._masks = np.array([zone.mask for zone in self.zones])
+            self._offsets = (1 - self._masks) * _OUTSIDE
+            self._counts = np.sum(self._masks, axis=1)
+
+    def update(self, data):
+        """Update zone statistics and alarm states from a frame of sensor
+        temperatures in Celsius. Returns the list of zones in alarm."""
+        if not self.zones:
+            return []
+        pixels = data.reshape((self._size,))
+        # One vectorized pass for all zones: masked maximum and masked average
+        zone_max = np.max(self._masks * pixels + self._offsets, axis=1)
+        zone_ave = np.dot(self._masks, pixels) / self._counts
+        alarms = []
+        for i, zone in enumerate(self.zones):
+            zone.max_c = zone_max[i]
+            zone.ave_c = zone_ave[i]
+            if zone.max_c >= zone.alarm_c:
+                zone.alarm = True
+            elif zone.max_c < zone.alarm_c - zone.hysteresis_c:
+                zone.alarm = False
+            if zone.alarm:
+                alarms.append(zone)
+        return alarms
@@ -0,0 +1,175 @@
+# SPDX-FileCopyrightText: 2023 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+
+"""
+`bdf_to_pcf`
+================================================================================
+Host-side BDF to PCF font converter.
+
+Converts a BDF text font into the compact binary PCF format read by
+``adafruit_bitmap_font``. PCF glyph metrics and bitmaps are located by table
+offset, so loading a glyph on the device requires no text parsing. The glyph set
+can be limited to a subset of characters to reduce the file size.
+
+Usage (CPython on the host computer, not on the device)::
+
+    python tools/bdf_to_pcf.py thermalcamera/fonts/OpenSans-9.bdf \\
+        thermalcamera/fonts/OpenSans-9.pcf
+
+The default subset is printable ASCII plus the degree sign; use ``--all`` to
+convert every glyph.
+"""
+
+import struct
+import sys
+
+# PCF table types
+PCF_ACCELERATORS = 1 << 1
+PCF_METRICS = 1 << 2
+PCF_BITMAPS = 1 << 3
+PCF_BDF_ENCODINGS = 1 << 5
+
+# Table format: most significant byte and bit first
+PCF_FORMAT = (1 << 2) | (1 << 3)
+PCF_BITMAP_FORMAT = PCF_FORMAT | 2  # Glyph rows padded to 4 bytes
+PCF_ACCEL_W_INKBOUNDS = 0x100  # Accelerators include the font bounding box
+
+# Default subset: printable ASCII and the degree sign
+DEFAULT_GLYPHS = set(range(32, 127)) | {0xB0}
+
+
+def read_bdf(path, code_points=None):
+    """Read a BDF font; returns the font bounding box, ascent, descent, and a
+    dictionary of glyphs keyed by code point. Each glyph is a tuple of
+    (width, height, x_offset, y_offset, shift_x, rows)."""
+    bounding_box = None
+    ascent = descent = 0
+    glyphs = {}
+    with open(path, "r", encoding="latin-1") as bdf:
+        lines = iter(bdf.read().splitlines())
+    for line in lines:
+        fields = line.split()
+        if not fields:
+            continue
+        if fields[0] == "FONTBOUNDINGBOX":
+            bounding_box = [int(field) for field in fields[1:5]]
+        elif fields[0] == "FONT_ASCENT":
+            ascent = int(fields[1])
+        elif fields[0] == "FONT_DESCENT":
+            descent = int(fields[1])
+        elif fields[0] == "STARTCHAR":
+            code_point, shift_x, bbx, rows = None, 0, None, []
+            for line in lines:  # pylint: disable=redefined-outer-name
+                fields = line.split()
+                if fields[0] == "ENCODING":
+                    code_point = int(fields[1])
+                elif fields[0] == "DWIDTH":
+                    shift_x = int(fields[1])
+                elif fields[0] == "BBX":
+                    bbx = [int(field) for field in fields[1:5]]
+                elif fields[0] == "BITMAP":
+                    for _ in range(bbx[1]):
+                        rows.append(bytes.fromhex(next(lines).strip()))
+                elif fields[0] == "ENDCHAR":
+                    break
+            if code_point is None or code_point < 0:
+                continue
+            if code_points is None or code_point in code_points:
+                glyphs[code_point] = (*bbx, shift_x, rows)
+    return bounding_box, ascent, descent, glyphs
+
+
+def glyph_metrics(glyph):
+    """PCF metrics for a glyph: left and right side bearing, character width,
+    ascent, descent, and attributes."""
+    width, height, x_offset, y_offset, shift_x, _ = glyph
+    return (x_offset, x_offset + width, shift_x, y_offset + height, -y_offset, 0)
+
+
+def table(format_, data):
+    """A PCF table: the little-endian format word followed by the data."""
+    table_data = struct.pack("<I", format_) + data
+    return table_data + bytes(-len(table_data) % 4)
+
+
+def build_pcf(bounding_box, ascent, descent, glyphs):
+    """Build the PCF file contents from BDF font data."""
+    code_points = sorted(glyphs)
+    metrics = [glyph_metrics(glyphs[code_point]) for code_point in code_points]
+
+    # Accelerators: font-wide ascent/descent and glyph minimum/maximum bounds
+    minbounds = [min(metric[i] for metric in metrics) for i in range(6)]
+    maxbounds = [max(metric[i] for metric in metrics) for i in range(6)]
+    accelerators = struct.pack(">BBBBBBBBIII", 0, 0, 0, 0, 0, 0, 0, 0, ascent, descent, 0)
+    accelerators += struct.pack(">5hH", *minbounds) + struct.pack(">5hH", *maxbounds)
+    # Ink bounds carry the BDF font bounding box so that a subset font reports
+    # the same bounding box (and text layout) as the original font
+    width, height, x_offset, y_offset = bounding_box
+    ink_minbounds = (x_offset, x_offset, 0, 0, 0, 0)
+    ink_maxbounds = (0, x_offset + width, 0, y_offset + height, -y_offset, 0)
+    accelerators += struct.pack(">5hH", *ink_minbounds)
+    accelerators += struct.pack(">5hH", *ink_maxbounds)
+
+    metrics_data = struct.pack(">I", len(metrics))
+    for metric in metrics:
+        metrics_data += struct.pack(">5hH", *metric)
+
+    # Bitmaps: one row per 4-byte padded word, most significant bit first
+    offsets = []
+    bitmap_data = b""
+    for code_point in code_points:
+        width, _, _, _, _, rows = glyphs[code_point]
+        offsets.append(len(bitmap_data))
+        row_size = ((width + 31) // 32) * 4
+        for row in rows:
+            bitmap_data += row[:row_size] + bytes(row_size - len(row[:row_size]))
+    bitmaps = struct.pack(">I", len(code_points))
+    bitmaps += struct.pack(f">{len(offsets)}I", *offsets)
+    sizes = [0, 0, len(bitmap_data), 0]  # Only the 4-byte padded size is used
+    bitmaps += struct.pack(">4I", *sizes) + bitmap_data
+
+    # Encodings: two-byte encoding table of glyph indices; 0xFFFF is missing
+    min_byte1 = min(code_point >> 8 for code_point in code_points)
+    max_byte1 = max(code_point >> 8 for code_point in code_points)
+    min_byte2 = min(code_point & 0xFF for code_point in code_points)
+    max_byte2 = max(code_point & 0xFF for code_point in code_points)
+    columns = max_byte2 - min_byte2 + 1
+    indices = [0xFFFF] * (columns * (max_byte1 - min_byte1 + 1))
+    for index, code_point in enumerate(code_points):
+        byte1, byte2 = code_point >> 8, code_point & 0xFF
+        indices[(byte1 - min_byte1) * columns + byte2 - min_byte2] = index
+    encodings = struct.pack(">hhhhh", min_byte2, max_byte2, min_byte1, max_byte1, 0)
+    encodings += struct.pack(f">{len(indices)}H", *indices)
+
+    tables = [
+        (PCF_ACCELERATORS, table(PCF_FORMAT | PCF_ACCEL_W_INKBOUNDS, accelerators)),
+        (PCF_METRICS, table(PCF_FORMAT, metrics_data)),
+        (PCF_BITMAPS, table(PCF_BITMAP_FORMAT, bitmaps)),
+        (PCF_BDF_ENCODINGS, table(PCF_FORMAT, encodings)),
+    ]
+    header = b"\x01fcp" + struct.pack("<I", len(tables))
+    offset = len(header) + 16 * len(tables)
+    body = b""
+    for type_, data in tables:
+        format_ = struct.unpack_from("<I", data)[0]
+        header += struct.pack("<IIII", type_, format_, len(data), offset + len(body))
+        body += data
+    return header + body
+
+
+def main(argv):
+    """Convert the BDF file named in argv to a PCF file."""
+    paths = [arg for arg in argv[1:] if not arg.startswith("--")]
+    if len(paths) != 2:
+        print(__doc__)
+        return 1
+    code_points = None if "--all" in argv else DEFAULT_GLYPHS
+    bounding_box, ascent, descent, glyphs = read_bdf(paths[0], code_points)
+    with open(paths[1], "wb") as pcf:
+        pcf.write(build_pcf(bounding_box, ascent, descent, glyphs))
+    print(f"{len(glyphs)} glyphs written to {paths[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))